@@ -0,0 +1,5 @@
+"""
+Benchmarks for the Huffman codec. Run from the filecompressor/ directory:
+
+    python -m benchmarks.corpus --output bench.json
+"""
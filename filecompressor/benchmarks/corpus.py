@@ -0,0 +1,241 @@
+"""
+End-to-end benchmark of compress_huffman / decompress_huffman.
+
+Runs over the sample/input corpus plus synthetic inputs of configurable sizes and reports
+throughput, compression ratio, peak RSS and per-stage time. Every case runs in a fresh
+process so its peak RSS is not inflated by earlier cases.
+
+    python -m benchmarks.corpus
+    python -m benchmarks.corpus --sizes 1K,1M,64M,1G --output after.json --compare before.json
+    python -m benchmarks.corpus --search-depth 16     # with the LZ77 stage
+    python -m benchmarks.corpus --max-code-length 12  # length-limited codes, with the ratio lost vs unlimited
+    python -m benchmarks.corpus --codec auto          # any registered codec, or auto selection
+    python -m benchmarks.corpus --no-numpy            # byte counting without NumPy, to measure its speedup
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from compressor.algorithm import huffman_full
+from compressor.algorithm.huffman_full import (
+    byte_histogram,
+    calculate_compression_ratio,
+    canonical_huffman_code,
+    compress_huffman,
+    decompress_huffman,
+    encode_data_to_bitarray,
+    huffman_code_lengths,
+)
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, "..", "..", "sample", "input")
+DEFAULT_SIZES = "1K,64K,1M,16M"
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text):
+    """'64K' -> 65536"""
+    text = text.strip().upper()
+    if text[-1] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
+
+
+def synthetic_data(size, seed=0):
+    """
+    Deterministic text-like input: a 1 MiB base of skewed byte frequencies, repeated with a
+    different rotation each time so consecutive megabytes are not identical.
+    """
+    rng = random.Random(seed)
+    alphabet = list(range(32, 127)) + [10]
+    weights = [1 / (rank + 1) for rank in range(len(alphabet))]  # Zipf-like, as in natural text
+    rng.shuffle(weights)
+    base = bytes(rng.choices(alphabet, weights, k=min(size, 1 << 20)))
+
+    parts = []
+    remaining = size
+    while remaining > 0:
+        shift = rng.randrange(len(base))
+        part = (base[shift:] + base[:shift])[:remaining]
+        parts.append(part)
+        remaining -= len(part)
+    return b"".join(parts)
+
+
+def load_case(case):
+    """Return the input bytes of a case description."""
+    if case["kind"] == "file":
+        with open(case["path"], "rb") as file:
+            return file.read()
+    return synthetic_data(case["size"])
+
+
+def best_time(func, repeat):
+    """Run func repeat times. Returns: (best wall-clock seconds, last result)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_case(case, repeat, search_depth=0, max_code_length=None, codec="huffman", use_numpy=True):
+    """
+    Benchmark one input inside a worker process.
+    use_numpy=False counts bytes with the Counter fallback even when NumPy is installed.
+    Returns: Result dict (JSON-serializable)
+    """
+    if not use_numpy:
+        huffman_full.np = None  # Only affects this worker process
+    data = load_case(case)
+
+    compress_s, compressed = best_time(lambda: compress_huffman(data, "bin", search_depth=search_depth,
+                                                                 max_code_length=max_code_length, codec=codec), repeat)
+    decompress_s, (decoded, _) = best_time(lambda: decompress_huffman(compressed), repeat)
+    if decoded != data:
+        raise RuntimeError(f"{case['name']}: round trip mismatch")
+
+    # Per-stage time of one whole-input pass through the compression pipeline
+    stages = {}
+    stages["count"], freq_table = best_time(lambda: byte_histogram(data), repeat)
+    stages["code_lengths"], code_lengths = best_time(lambda: huffman_code_lengths(freq_table), repeat)
+    stages["canonical_codes"], code_map = best_time(lambda: canonical_huffman_code(code_lengths), repeat)
+    stages["encode"], _ = best_time(lambda: encode_data_to_bitarray(data, code_map), repeat)
+
+    megabytes = len(data) / (1024 * 1024)
+    result = {
+        "name": case["name"],
+        "size": len(data),
+        "compressed_size": len(compressed),
+        "ratio": calculate_compression_ratio(len(data), len(compressed)),
+        "compress_s": compress_s,
+        "decompress_s": decompress_s,
+        "compress_mb_s": megabytes / compress_s if compress_s else None,
+        "decompress_mb_s": megabytes / decompress_s if decompress_s else None,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        "stages_s": stages,
+    }
+
+    if max_code_length is not None:
+        # Percentage points of ratio given up by limiting the code length
+        unlimited = compress_huffman(data, "bin", search_depth=search_depth, codec=codec)
+        result["ratio_unlimited"] = calculate_compression_ratio(len(data), len(unlimited))
+        result["ratio_loss"] = round(result["ratio_unlimited"] - result["ratio"], 4)
+    return result
+
+
+def build_cases(corpus_dir, sizes):
+    """List the corpus files and synthetic sizes to benchmark."""
+    cases = []
+    if os.path.isdir(corpus_dir):
+        for name in sorted(os.listdir(corpus_dir)):
+            path = os.path.join(corpus_dir, name)
+            if os.path.isfile(path) and os.path.getsize(path):
+                cases.append({"kind": "file", "name": name, "path": path})
+
+    for size in sizes:
+        cases.append({"kind": "synthetic", "name": f"synthetic-{size}", "size": size})
+    return cases
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCHMARK_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results, baseline=None):
+    """Print one row per case; with a baseline, add the compress/decompress speed change."""
+    previous = {result["name"]: result for result in (baseline or {}).get("results", [])}
+    limited = any("ratio_loss" in result for result in results)
+    header = f"{'case':34} {'size':>11} {'ratio %':>8} {'comp MB/s':>10} {'decomp MB/s':>12} {'RSS MB':>8}"
+    header += f" {'loss pp':>8}" if limited else ""
+    print(header + ("  vs baseline" if baseline else ""))
+
+    for result in results:
+        row = (f"{result['name'][:34]:34} {result['size']:>11} {result['ratio']:>8} "
+               f"{result['compress_mb_s']:>10.2f} {result['decompress_mb_s']:>12.2f} {result['peak_rss_mb']:>8.1f}")
+        if limited:
+            row += f" {result['ratio_loss']:>8.4f}"
+        old = previous.get(result["name"])
+        if old:
+            row += (f"  comp {result['compress_mb_s'] / old['compress_mb_s'] - 1:+.1%}"
+                    f" decomp {result['decompress_mb_s'] / old['decompress_mb_s'] - 1:+.1%}")
+        print(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="Directory of real input files")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="Comma-separated synthetic input sizes, e.g. 1K,1M,1G (empty for none)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept")
+    parser.add_argument("--search-depth", type=int, default=0,
+                        help="LZ77 hash chain candidates per position (0 = plain Huffman)")
+    parser.add_argument("--max-code-length", type=int, default=None,
+                        help="Limit Huffman codes to this many bits and report the ratio lost (percentage points)")
+    parser.add_argument("--codec", default="huffman", help="Registered codec name, or auto")
+    parser.add_argument("--no-numpy", action="store_true", help="Count bytes without NumPy even if it is installed")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    cases = build_cases(args.corpus, sizes)
+
+    results = []
+    for case in cases:
+        # A fresh process per case keeps peak RSS attributable to that case
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            future = pool.submit(run_case, case, args.repeat, args.search_depth, args.max_code_length, args.codec,
+                                 not args.no_numpy)
+            results.append(future.result())
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "search_depth": args.search_depth,
+        "max_code_length": args.max_code_length,
+        "codec": args.codec,
+        "numpy": None if args.no_numpy or huffman_full.np is None else huffman_full.np.__version__,
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_table(results, baseline)
+    if args.max_code_length is not None:
+        total = sum(result["size"] for result in results)
+        loss = sum(result["ratio_loss"] * result["size"] for result in results) / total if total else 0
+        print(f"Ratio lost to {args.max_code_length}-bit codes: {loss:.4f} pp (size-weighted)")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
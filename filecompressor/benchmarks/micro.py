@@ -0,0 +1,233 @@
+"""
+Microbenchmarks of the hot functions in compressor/algorithm/huffman_full.py, with a regression gate.
+
+Every benchmark times one function on a fixed ~1 MiB text input and compares the best
+per-call time with its own baseline file in --baseline-dir. The run fails (exit status 1)
+when any benchmark is slower than its baseline by more than --max-slowdown.
+byte_histogram is timed twice: with NumPy (only when it is installed) and with its Counter fallback.
+
+    python -m benchmarks.micro --save-baseline          # record baselines on this machine
+    python -m benchmarks.micro --max-slowdown 0.15      # gate: fail on >15% slowdown
+    python -m benchmarks.micro -k encode decode         # only benchmarks whose name matches
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from collections import Counter
+
+from bitarray import bitarray
+
+from compressor.algorithm import huffman_full
+from compressor.algorithm.huffman_full import (
+    build_huffman_tree,
+    byte_histogram,
+    canonical_huffman_code,
+    decode_data,
+    decode_payload,
+    encode_data_to_bitarray,
+    generate_huffman_code,
+    huffman_code_lengths,
+    load_frequency_table,
+)
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FILE = os.path.join(BENCHMARK_DIR, "..", "..", "sample", "input", "sample.txt")
+DEFAULT_BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+INPUT_SIZE = 1 << 20
+
+BENCHMARKS = {}  # name -> setup function returning the zero-argument callable to time
+
+
+def benchmark(name):
+    """Register a benchmark. The decorated function does the (untimed) setup and returns the timed callable."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def sample_input():
+    """About 1 MiB of real text: sample.txt repeated."""
+    with open(SAMPLE_FILE, "rb") as file:
+        text = file.read()
+    return (text * (INPUT_SIZE // len(text) + 1))[:INPUT_SIZE]
+
+
+def huf1_file(data):
+    """Legacy HUF1 bytes for data (frequency table header), as the old compressor wrote them."""
+    freq_table = Counter(data)
+    header = bytearray(b"HUF1") + bytes([3]) + b"txt" + len(freq_table).to_bytes(2, "big")
+    for symbol, freq in freq_table.items():
+        header += bytes([symbol]) + freq.to_bytes(8, "big")
+
+    code_map = {}
+    generate_huffman_code(build_huffman_tree(freq_table), "", code_map)
+    return bytes(header) + encode_data_to_bitarray(data, code_map)
+
+
+@benchmark("counter_frequency")
+def bench_counter():
+    data = sample_input()
+    return lambda: Counter(data)
+
+
+if huffman_full.np is not None:
+    @benchmark("byte_histogram_numpy")
+    def bench_byte_histogram_numpy():
+        data = sample_input()
+        return lambda: byte_histogram(data)
+
+
+@benchmark("byte_histogram_counter")
+def bench_byte_histogram_counter():
+    data = sample_input()
+
+    def count_without_numpy():
+        numpy, huffman_full.np = huffman_full.np, None  # Force the Counter fallback for this call only
+        try:
+            return byte_histogram(data)
+        finally:
+            huffman_full.np = numpy
+    return count_without_numpy
+
+
+@benchmark("build_huffman_tree")
+def bench_build_tree():
+    freq_table = Counter(sample_input())
+    return lambda: build_huffman_tree(freq_table)
+
+
+@benchmark("generate_huffman_code")
+def bench_generate_code():
+    root = build_huffman_tree(Counter(sample_input()))
+    return lambda: generate_huffman_code(root, "", {})
+
+
+@benchmark("huffman_code_lengths")
+def bench_code_lengths():
+    freq_table = Counter(sample_input())
+    return lambda: huffman_code_lengths(freq_table)
+
+
+@benchmark("canonical_huffman_code")
+def bench_canonical_code():
+    code_lengths = huffman_code_lengths(Counter(sample_input()))
+    return lambda: canonical_huffman_code(code_lengths)
+
+
+@benchmark("encode_data_to_bitarray")
+def bench_encode():
+    data = sample_input()
+    code_map = canonical_huffman_code(huffman_code_lengths(Counter(data)))
+    return lambda: encode_data_to_bitarray(data, code_map)
+
+
+@benchmark("load_frequency_table")
+def bench_load_frequency_table():
+    compressed = huf1_file(sample_input())
+    return lambda: load_frequency_table(compressed, from_bytes=True)
+
+
+@benchmark("decode_data")
+def bench_decode_data():
+    data = sample_input()
+    freq_table = Counter(data)
+    code_map = {}
+    root = build_huffman_tree(freq_table)
+    generate_huffman_code(root, "", code_map)
+    payload = encode_data_to_bitarray(data, code_map)
+
+    bits = bitarray()
+    bits.frombytes(payload[1:])
+    if payload[0]:
+        del bits[-payload[0]:]
+    return lambda: decode_data(bits, root)
+
+
+@benchmark("decode_payload")
+def bench_decode_payload():
+    data = sample_input()
+    code_map = canonical_huffman_code(huffman_code_lengths(Counter(data)))
+    payload = encode_data_to_bitarray(data, code_map)
+    return lambda: decode_payload(payload, code_map)
+
+
+def measure(func, repeat):
+    """
+    Best per-call time of func, timeit-style: calibrate the loop count so one
+    round takes at least 0.2 s, then keep the fastest of repeat rounds.
+    Returns: (seconds per call, calls per round)
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    rounds = timer.repeat(repeat=repeat, number=number)
+    return min(rounds) / number, number
+
+
+def baseline_path(baseline_dir, name):
+    return os.path.join(baseline_dir, f"{name}.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", nargs="*", default=[], help="Only run benchmarks whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per benchmark; the best is kept")
+    parser.add_argument("--baseline-dir", default=DEFAULT_BASELINE_DIR, help="Directory of per-benchmark baseline files")
+    parser.add_argument("--save-baseline", action="store_true", help="Record the measured times as the new baselines")
+    parser.add_argument("--max-slowdown", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline before failing (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    selected = [name for name in BENCHMARKS if not args.k or any(key in name for key in args.k)]
+    if not selected:
+        parser.error("no benchmark matches -k")
+
+    regressions = []
+    print(f"{'benchmark':26} {'per call':>12} {'baseline':>12} {'change':>8}")
+    for name in selected:
+        seconds, number = measure(BENCHMARKS[name](), args.repeat)
+        path = baseline_path(args.baseline_dir, name)
+
+        baseline = None
+        if os.path.exists(path) and not args.save_baseline:
+            with open(path) as file:
+                baseline = json.load(file)["seconds"]
+
+        if baseline:
+            change = seconds / baseline - 1
+            verdict = "  REGRESSION" if change > args.max_slowdown else ""
+            print(f"{name:26} {seconds * 1e3:>10.3f}ms {baseline * 1e3:>10.3f}ms {change:>+8.1%}{verdict}")
+            if verdict:
+                regressions.append(name)
+        else:
+            print(f"{name:26} {seconds * 1e3:>10.3f}ms {'-':>12} {'-':>8}")
+
+        if args.save_baseline:
+            os.makedirs(args.baseline_dir, exist_ok=True)
+            with open(path, "w") as file:
+                json.dump({
+                    "name": name,
+                    "seconds": seconds,
+                    "calls_per_round": number,
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                }, file, indent=2)
+
+    if args.save_baseline:
+        print(f"Baselines written to {args.baseline_dir}")
+    if regressions:
+        print(f"FAILED: {len(regressions)} benchmark(s) slower than baseline by more than {args.max_slowdown:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
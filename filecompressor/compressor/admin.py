@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("file_name", "operation", "status", "bytes_done", "bytes_total", "created_at")
+    list_filter = ("operation", "status")
@@ -1,9 +1,46 @@
-
-
-from .huffman_full import compress_huffman, decompress_huffman, calculate_compression_ratio
+from .huffman_full import (
+    compress_huffman,
+    decompress_huffman,
+    compress_stream,
+    decompress_stream,
+    iter_compress,
+    iter_decompress,
+    decompress_range,
+    compress_file,
+    decompress_file,
+    map_file,
+    container_codecs,
+    calculate_compression_ratio,
+)
+from .archive import compress_archive, extract_all, extract_member, is_archive, list_archive, member_filename
+from .instrumentation import StageStats, collect_stages
+from . import dictionaries  # Registers the dict:<name> codecs, also in worker processes
+from .registry import AUTO, POLICIES, choose_codec, codec_names, register_codec
 
 __all__ = [
     "compress_huffman",
     "decompress_huffman",
+    "compress_stream",
+    "decompress_stream",
+    "iter_compress",
+    "iter_decompress",
+    "decompress_range",
+    "compress_file",
+    "decompress_file",
+    "map_file",
+    "container_codecs",
     "calculate_compression_ratio",
-]
\ No newline at end of file
+    "compress_archive",
+    "extract_all",
+    "extract_member",
+    "is_archive",
+    "list_archive",
+    "member_filename",
+    "StageStats",
+    "collect_stages",
+    "AUTO",
+    "POLICIES",
+    "choose_codec",
+    "codec_names",
+    "register_codec",
+]
@@ -0,0 +1,257 @@
+"""
+Multi-file archives of Huffman-compressed members (HUFA).
+
+An archive is the concatenation of complete HUF3 containers, one per file, followed by a
+central directory listing each member's name, extension, offset and sizes. Members are
+compressed independently (in parallel with workers > 1), and a single member is extracted
+by reading the directory and then only that member's bytes.
+
+Layout: b"HUFA" + members + directory + entry count (4 bytes) + directory offset (8 bytes) + b"HUFC"
+Directory entry: name length (2 bytes) + name + extension length (1 byte) + extension
+                 + member offset (8 bytes) + compressed size (8 bytes) + original size (8 bytes)
+An empty file is stored as an empty member (compressed size 0).
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from .huffman_full import buffer_reader, compress_huffman, decompress_huffman, file_reader, map_file, resolve_workers
+
+
+ARCHIVE_MAGIC = b"HUFA"             # Archive signature
+DIRECTORY_MAGIC = b"HUFC"           # Trailing central directory signature
+DIRECTORY_FOOTER_SIZE = 16          # Entry count (4 bytes) + directory offset (8 bytes) + signature
+
+ArchiveMember = namedtuple("ArchiveMember", "name ext offset compressed_size original_size")
+
+
+def member_filename(member):
+    """Returns: The member's file name, with its extension."""
+    return f"{member.name}.{member.ext}" if member.ext else member.name
+
+
+# -------------------------------------------------- Archiving ----------------------------------------------------------
+
+def compress_member(filename, source, options):
+    """
+    Compresses one archive member; runs in a worker process when members are compressed in parallel.
+    source: bytes/buffer, or a path to the member's content, memory-mapped here (so a worker
+    process receives only the path, not the content)
+    Returns: name (str), ext (str), compressed member bytes, original size (int)
+    """
+    name, ext = os.path.splitext(os.path.basename(filename))
+    ext = ext[1:]
+    if not isinstance(source, (str, os.PathLike)):
+        return name, ext, compress_huffman(source, ext, **options), len(source)
+
+    view = map_file(source)
+    try:
+        return name, ext, compress_huffman(view, ext, **options), len(view)
+    finally:
+        view.release()
+
+
+def build_directory(members, directory_offset) -> bytes:
+    """
+    Serializes the central directory and its footer.
+    Returns: Directory bytes.
+    """
+    directory = bytearray()
+    for member in members:
+        name = member.name.encode("utf-8")
+        ext = member.ext.encode("utf-8")
+        if len(name) > 0xFFFF:
+            raise ValueError("Member name too long")
+
+        directory += len(name).to_bytes(2, 'big') + name + bytes([len(ext)]) + ext
+        directory += member.offset.to_bytes(8, 'big')
+        directory += member.compressed_size.to_bytes(8, 'big')
+        directory += member.original_size.to_bytes(8, 'big')
+
+    directory += len(members).to_bytes(4, 'big') + directory_offset.to_bytes(8, 'big') + DIRECTORY_MAGIC
+    return bytes(directory)
+
+
+def compress_archive(files, workers: int = 1, **options) -> bytes:
+    """
+    Builds an archive from several files.
+    files: list of (file name, source) pairs; names must be unique. A source is bytes/buffer, or a path to
+    the content (e.g. an upload's temporary file), which is memory-mapped instead of read into memory.
+    workers > 1 compresses the members in a pool of spawned processes (None uses every core); the output is
+    identical. Path sources are sent to the workers as paths, other sources are copied to them as bytes.
+    Spawned workers don't inherit the caller's threads or locks, so this is safe inside a server.
+    options are passed to compress_huffman for every member (block_size, codec, policy, ...).
+    Returns: Archive bytes.
+    """
+    if not files:
+        raise ValueError("An archive needs at least one file")
+
+    filenames = [os.path.basename(filename) for filename, _ in files]
+    if len(set(filenames)) != len(filenames):
+        raise ValueError("Duplicate file name in archive")
+
+    workers = min(resolve_workers(workers), len(files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            sources = [source if isinstance(source, (str, os.PathLike)) else bytes(source) for _, source in files]
+            results = list(pool.map(compress_member, filenames, sources, [options] * len(files)))
+    else:
+        results = [compress_member(filename, source, options) for filename, (_, source) in zip(filenames, files)]
+
+    parts = [ARCHIVE_MAGIC]
+    members = []
+    position = len(ARCHIVE_MAGIC)
+    for name, ext, compressed, original_size in results:
+        members.append(ArchiveMember(name, ext, position, len(compressed), original_size))
+        parts.append(compressed)
+        position += len(compressed)
+
+    parts.append(build_directory(members, position))
+    return b"".join(parts)
+
+
+# -------------------------------------------------- Extracting ----------------------------------------------------------
+
+def is_archive(data) -> bool:
+    """Returns: Whether data (or its first bytes) starts with the archive signature."""
+    return bytes(data[:4]) == ARCHIVE_MAGIC
+
+
+def read_directory(read_at, total_size):
+    """
+    Reads the central directory through a read_at(offset, size) function.
+    Returns: List of ArchiveMember.
+    """
+    if total_size < len(ARCHIVE_MAGIC) + DIRECTORY_FOOTER_SIZE or bytes(read_at(0, 4)) != ARCHIVE_MAGIC:
+        raise ValueError("Invalid archive — missing signature")
+
+    footer = bytes(read_at(total_size - DIRECTORY_FOOTER_SIZE, DIRECTORY_FOOTER_SIZE))
+    if footer[12:] != DIRECTORY_MAGIC:
+        raise ValueError("Invalid archive — missing central directory")
+
+    count = int.from_bytes(footer[:4], 'big')
+    directory_offset = int.from_bytes(footer[4:12], 'big')
+    directory_end = total_size - DIRECTORY_FOOTER_SIZE
+    if not len(ARCHIVE_MAGIC) <= directory_offset <= directory_end:
+        raise ValueError("Invalid archive — directory offset out of range")
+
+    directory = bytes(read_at(directory_offset, directory_end - directory_offset))
+    members = []
+    position = 0
+    for _ in range(count):
+        name_len = int.from_bytes(directory[position:position + 2], 'big')
+        name = directory[position + 2:position + 2 + name_len].decode("utf-8")
+        position += 2 + name_len
+
+        ext_len = directory[position]
+        ext = directory[position + 1:position + 1 + ext_len].decode("utf-8")
+        position += 1 + ext_len
+
+        offset, compressed_size, original_size = (int.from_bytes(directory[position + i:position + i + 8], 'big')
+                                                  for i in (0, 8, 16))
+        position += 24
+
+        if offset + compressed_size > directory_offset:
+            raise ValueError("Invalid archive — member out of range")
+        members.append(ArchiveMember(name, ext, offset, compressed_size, original_size))
+
+    if position != len(directory):
+        raise ValueError("Invalid archive — corrupted central directory")
+    return members
+
+
+def list_archive(source):
+    """
+    Lists the members of an archive, reading only its central directory.
+    source: archive bytes/buffer, or a path to an archive file
+    Returns: List of ArchiveMember.
+    """
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                return read_directory(file_reader(file), file.seek(0, os.SEEK_END))
+        return read_directory(buffer_reader(source), len(source))
+
+    except Exception as e:
+        raise ValueError(f"Decompression failed: {str(e)}")
+
+
+def find_member(members, member):
+    """
+    Resolves a member given by index or by file name.
+    Returns: ArchiveMember
+    """
+    if isinstance(member, int):
+        if not 0 <= member < len(members):
+            raise ValueError(f"No member {member} in archive")
+        return members[member]
+
+    for entry in members:
+        if member_filename(entry) == member:
+            return entry
+    raise ValueError(f"No member named {member!r} in archive")
+
+
+def decode_member(compressed, member):
+    """
+    Decodes one member's bytes and checks them against the directory.
+    Returns: Original bytes of the member.
+    """
+    if member.compressed_size == 0:
+        data = b""
+    else:
+        data, _ = decompress_huffman(compressed)
+    if len(data) != member.original_size:
+        raise ValueError("Member length mismatch — corrupted data")
+    return data
+
+
+def extract_member(source, member):
+    """
+    Extracts a single member without decoding the others; from a path only the directory
+    and that member are read.
+    source: archive bytes/buffer, or a path to an archive file
+    member: index (int) or file name (str)
+    Returns: filename (str), data (bytes)
+    """
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                read_at = file_reader(file)
+                entry = find_member(read_directory(read_at, file.seek(0, os.SEEK_END)), member)
+                compressed = read_at(entry.offset, entry.compressed_size)
+        else:
+            read_at = buffer_reader(source)
+            entry = find_member(read_directory(read_at, len(source)), member)
+            compressed = read_at(entry.offset, entry.compressed_size)
+
+        return member_filename(entry), decode_member(compressed, entry)
+
+    except Exception as e:
+        raise ValueError(f"Decompression failed: {str(e)}")
+
+
+def extract_all(data, workers: int = 1):
+    """
+    Extracts every member of an in-memory archive.
+    workers > 1 decodes the members in a pool of spawned processes (None uses every core).
+    Returns: List of (filename, bytes) pairs in archive order.
+    """
+    members = list_archive(data)
+    view = memoryview(data)
+    compressed = [bytes(view[m.offset:m.offset + m.compressed_size]) for m in members]
+
+    try:
+        workers = min(resolve_workers(workers), max(len(members), 1))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+                decoded = list(pool.map(decode_member, compressed, members))
+        else:
+            decoded = [decode_member(body, member) for body, member in zip(compressed, members)]
+
+    except Exception as e:
+        raise ValueError(f"Decompression failed: {str(e)}")
+
+    return [(member_filename(member), data) for member, data in zip(members, decoded)]
@@ -0,0 +1,239 @@
+"""
+Pre-trained static Huffman dictionaries.
+
+A dictionary is a complete code length table over all 256 byte values, trained once on a
+corpus of typical traffic (CSV exports, logs, Python source, ...) and shipped in
+DICTIONARY_DIR under a permanent one-byte id. A BLOCK_DICTIONARY frame stores only that id
+instead of a code length table, and encoding skips the frequency count, which pays off for
+small files and for inputs whose statistics match the training corpus.
+
+Every shipped dictionary is registered as the codec "dict:<name>", so it can be requested
+explicitly or picked by auto mode. Built code maps and decode trees are cached per id.
+
+Ids are permanent: files refer to them, so a dictionary must never be retrained under an id
+that has been shipped — train it under a new id instead.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+from bitarray import bitarray
+
+from .huffman_full import byte_histogram, canonical_huffman_code, build_decode_tree, huffman_code_lengths, read_code_lengths, write_code_lengths
+from .registry import register_codec
+
+
+BLOCK_DICTIONARY = 7                # Frame type of a block coded with a static dictionary
+DICTIONARY_MAGIC = b"HUFD"          # Dictionary file signature
+DICTIONARY_SUFFIX = ".hufd"
+DICTIONARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dictionaries")
+DICTIONARY_MAX_CODE_LENGTH = 15     # Bytes never seen in training still get a code, capped at this length
+DICTIONARY_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,32}$")  # Safe in a codec name and a file name
+
+
+# -------------------------------------------------- Training ----------------------------------------------------------
+
+def train_dictionary(samples, max_code_length: int = DICTIONARY_MAX_CODE_LENGTH):
+    """
+    Builds a static code length table from training samples.
+    Every byte value is counted once more than it occurs, so inputs containing bytes that never
+    appeared in training can still be encoded.
+    samples: iterable of bytes-like objects
+    Returns: dict mapping every byte value → code length in bits
+    """
+    histogram = [1] * 256
+    for sample in samples:
+        histogram = byte_histogram(sample, histogram)
+    return huffman_code_lengths(histogram, max_code_length)
+
+
+def write_dictionary(dict_id: int, name: str, code_lengths) -> bytes:
+    """
+    Serializes a dictionary.
+    Layout: b"HUFD" + id (1 byte) + name length (1 byte) + name + code length table
+    Returns: Dictionary file bytes.
+    """
+    if not 0 < dict_id < 256:
+        raise ValueError("Dictionary id must be between 1 and 255")
+    if len(code_lengths) != 256:
+        raise ValueError("A dictionary must have a code for every byte value")
+
+    if not DICTIONARY_NAME_PATTERN.match(name):
+        raise ValueError("Dictionary name must be 1-32 letters, digits, '_' or '-'")
+    name_bytes = name.encode("utf-8")
+
+    return DICTIONARY_MAGIC + bytes([dict_id, len(name_bytes)]) + name_bytes + write_code_lengths(code_lengths)
+
+
+def save_dictionary(dict_id: int, name: str, code_lengths, directory: str = DICTIONARY_DIR):
+    """
+    Writes a dictionary file into directory, refusing to reuse an existing id or name
+    (a second "dict:<name>" codec could not be registered).
+    Returns: Path of the new file.
+    """
+    data = write_dictionary(dict_id, name, code_lengths)  # Validates the id and name first
+
+    for existing_id, (existing_name, _) in scan_dictionaries(directory).items():
+        if existing_id == dict_id:
+            raise ValueError(f"Dictionary id {dict_id} is already taken by {existing_name}")
+        if existing_name == name:
+            raise ValueError(f"Dictionary name {name!r} is already taken by id {existing_id}")
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{dict_id:03d}-{name}{DICTIONARY_SUFFIX}")
+    with open(path, "wb") as file:
+        file.write(data)
+    return path
+
+
+# -------------------------------------------------- Loading ----------------------------------------------------------
+
+def read_dictionary(data):
+    """
+    Parses a dictionary file.
+    Returns: id (int), name (str), code_lengths (dict)
+    """
+    if len(data) < 6 or data[:4] != DICTIONARY_MAGIC:
+        raise ValueError("Invalid dictionary file — missing signature")
+
+    dict_id, name_len = data[4], data[5]
+    name = bytes(data[6:6 + name_len]).decode("utf-8")
+    code_lengths, _ = read_code_lengths(data, 6 + name_len)
+    if len(code_lengths) != 256:
+        raise ValueError("Invalid dictionary file — incomplete code length table")
+    return dict_id, name, code_lengths
+
+
+def scan_dictionaries(directory: str = DICTIONARY_DIR):
+    """
+    Reads every dictionary file of directory.
+    Returns: dict mapping id → (name, code_lengths)
+    """
+    dictionaries = {}
+    if not os.path.isdir(directory):
+        return dictionaries
+
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(DICTIONARY_SUFFIX):
+            continue
+        with open(os.path.join(directory, filename), "rb") as file:
+            dict_id, name, code_lengths = read_dictionary(file.read())
+        if dict_id in dictionaries:
+            raise ValueError(f"Duplicate dictionary id {dict_id} in {directory}")
+        if any(name == other for other, _ in dictionaries.values()):
+            raise ValueError(f"Duplicate dictionary name {name!r} in {directory}")
+        dictionaries[dict_id] = (name, code_lengths)
+    return dictionaries
+
+
+@lru_cache(maxsize=None)
+def load_dictionaries(directory: str = DICTIONARY_DIR):
+    """
+    Loads the dictionaries of directory once per process (see scan_dictionaries).
+    Returns: dict mapping id → (name, code_lengths)
+    """
+    return scan_dictionaries(directory)
+
+
+def get_dictionary(dict_id):
+    """
+    Looks a shipped dictionary up by id.
+    Returns: name (str), code_lengths (dict)
+    """
+    try:
+        return load_dictionaries()[dict_id]
+    except KeyError:
+        raise ValueError(f"Unknown dictionary id {dict_id}")
+
+
+@lru_cache(maxsize=None)
+def dictionary_codes(dict_id):
+    """
+    Builds (once) the encoding table of a dictionary.
+    Returns: dict mapping byte value → code bitarray
+    """
+    _, code_lengths = get_dictionary(dict_id)
+    return {symbol: bitarray(code) for symbol, code in canonical_huffman_code(code_lengths).items()}
+
+
+@lru_cache(maxsize=None)
+def dictionary_decode_tree(dict_id):
+    """
+    Builds (once) the decode tree of a dictionary.
+    Returns: bitarray decodetree
+    """
+    _, code_lengths = get_dictionary(dict_id)
+    return build_decode_tree(canonical_huffman_code(code_lengths))
+
+
+# -------------------------------------------------- Block Coding ----------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def dictionary_max_code_length(dict_id):
+    """Returns: Length in bits of the longest code of a dictionary."""
+    _, code_lengths = get_dictionary(dict_id)
+    return max(code_lengths.values())
+
+
+def encode_dictionary_body(dict_id, block, max_code_length=None):
+    """
+    Codes one block with a static dictionary; no frequency count, no table.
+    The dictionary's codes are fixed, so it cannot code the block when any of them is longer
+    than max_code_length.
+    Body layout: dictionary id (1 byte) + padding length + payload
+    Returns: Body bytes, or None if the dictionary exceeds max_code_length.
+    """
+    if max_code_length is not None and dictionary_max_code_length(dict_id) > max_code_length:
+        return None
+
+    bits = bitarray()
+    bits.encode(dictionary_codes(dict_id), block)
+    pad_len = bits.fill()
+    return bytes([dict_id, pad_len]) + bits.tobytes()
+
+
+def decode_dictionary_body(body, raw_len):
+    """
+    Decodes the body of a dictionary frame with the cached decode tree of its dictionary.
+    Returns: Decoded bytes of the block.
+    """
+    if len(body) < 2:
+        raise ValueError("Truncated dictionary block")
+
+    dict_id, pad_len = body[0], body[1]
+    bits = bitarray()
+    bits.frombytes(bytes(body[2:]))
+    if pad_len:
+        del bits[-pad_len:]
+
+    return bytes(bits.decode(dictionary_decode_tree(dict_id)))
+
+
+def dictionary_frame_name(read_body):
+    """Returns: "dict:<name>" of the dictionary whose id opens a frame body."""
+    body_head = read_body(1)
+    if not body_head:
+        raise ValueError("Truncated dictionary block")
+    name, _ = get_dictionary(body_head[0])
+    return f"dict:{name}"
+
+
+def require_dictionary_name(block, **_):
+    """The bare frame type codec only decodes; encoders are registered per dictionary."""
+    raise ValueError("Choose a dictionary codec by name (dict:<name>)")
+
+
+def register_dictionaries():
+    """
+    Registers the frame type decoder and one "dict:<name>" codec per shipped dictionary.
+    """
+    register_codec("dictionary", BLOCK_DICTIONARY, require_dictionary_name, decode_dictionary_body,
+                   selectable=False, frame_name=dictionary_frame_name)
+    for dict_id, (name, _) in sorted(load_dictionaries().items()):
+        register_codec(f"dict:{name}", BLOCK_DICTIONARY,
+                       lambda block, dict_id=dict_id, max_code_length=None, **_:
+                           encode_dictionary_body(dict_id, block, max_code_length))
+
+
+register_dictionaries()
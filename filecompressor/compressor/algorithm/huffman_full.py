@@ -1,18 +1,105 @@
 
 from collections import Counter  # For building frequency table of symbols
-from bitarray import bitarray     # Efficient bit array manipulation
+from bitarray import bitarray, decodetree  # Efficient bit array manipulation and C-level prefix decoding
+from bitarray.util import ba2int, int2ba
 import heapq                      # min-heap for Huffman tree construction
+import mmap                       # Memory-mapped file input
+import os
+from concurrent.futures import ProcessPoolExecutor     # Multi-core block coding
+from itertools import chain, repeat
+from multiprocessing.shared_memory import SharedMemory  # Zero-copy input handoff to worker processes
+
+try:
+    import numpy as np            # Optional: byte histograms in one C call (see byte_histogram)
+except ImportError:
+    np = None
+
+from .lz77 import (
+    DEFAULT_SEARCH_DEPTH,
+    DIST_ALPHABET_SIZE,
+    DIST_BASE,
+    DIST_EXTRA,
+    LENGTH_BASE,
+    LENGTH_EXTRA,
+    LENGTH_SYMBOL_BASE,
+    LITLEN_ALPHABET_SIZE,
+    distance_bucket,
+    expand_tokens,
+    find_matches,
+    length_bucket,
+)
+from .instrumentation import stage
+from .registry import AUTO, DEFAULT_POLICY, check_codec, choose_codec, codec_for_block_type, frame_codec_name, get_codec, register_codec
+
+
+CODEC_VERSION = 6                # Bump whenever compress_huffman's output for a given input changes
+
+# Block (HUF3) container constants
+DEFAULT_BLOCK_SIZE = 1 << 20     # 1 MiB of input per independently coded block
+MAX_BLOCK_SIZE = (1 << 32) - 1   # Block lengths are stored in 4 bytes
+
+BLOCK_END = 0                    # Frame type marking the end of the block sequence
+BLOCK_HUFFMAN = 1                # Frame type of a canonical Huffman block
+BLOCK_STORED = 2                 # Frame type of a block kept as raw bytes (incompressible input)
+BLOCK_LZ77 = 3                   # Frame type of an LZ77 block with Huffman-coded literals/lengths and distances
+# Further frame types come from the codec registry (registry.py): 4 zlib, 5 bz2, 6 lzma,
+# 7 static dictionary (dictionaries.py)
+
+MIN_CODE_LENGTH_LIMIT = 9        # Smallest max_code_length accepted (fits every symbol of the LZ77 alphabet)
+
+LZ77_SPEED = 0.4                 # MB/s of the pure-Python LZ77 stage (below the balanced and speed policies)
+
+MIN_BLOCK_SAVING = 0.02          # A block is stored raw unless Huffman coding saves at least this fraction
+
+END_FRAME = bytes([BLOCK_END])
+
+INDEX_MAGIC = b"HUFX"            # Trailing block index signature
+INDEX_ENTRY_SIZE = 12            # Frame offset (8 bytes) + raw length (4 bytes)
+INDEX_FOOTER_SIZE = 16           # Entry count (4 bytes) + index offset (8 bytes) + signature
+
+
+# -------------------------------------------------- Statistics ----------------------------------------------------------
+
+def byte_histogram(data, counts=None):
+    """
+    Counts every byte value of data, adding to counts when given, so a stream or a set of
+    samples can be counted chunk by chunk.
+    With NumPy this is one bincount over a zero-copy view of data; without it, Counter.
+    Both give the same counts, so the compressed output does not depend on NumPy.
+    Returns: list of 256 counts indexed by byte value
+    """
+    if np is not None:
+        histogram = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256).tolist()
+    else:
+        histogram = [0] * 256
+        for symbol, freq in Counter(data).items():
+            histogram[symbol] = freq
+
+    if counts is not None:
+        histogram = [old + new for old, new in zip(counts, histogram)]
+    return histogram
+
+
+def histogram_table(histogram):
+    """
+    Converts a histogram (counts indexed by symbol) to a frequency table of the symbols that
+    occur, in symbol order, so code lengths do not depend on where in the data a byte first appears.
+    Returns: dict mapping symbol → count
+    """
+    return {symbol: freq for symbol, freq in enumerate(histogram) if freq}
 
 
 # -------------------------------------------------- Compressing Functions ----------------------------------------------------------
 
 class Node:
     """
-    Node class for Huffman Tree.
+    Node class for Huffman Tree (legacy HUF1 files, whose codes depend on this heap's tie-breaking).
     symbol: Byte value for leaf nodes, None for internal nodes
     freq: Frequency of symbol or sum of child frequencies
     left, right: Child nodes
     """
+    __slots__ = ("symbol", "freq", "left", "right")
+
     def __init__(self, symbol, freq, left=None, right=None):
         self.symbol = symbol
         self.freq = freq
@@ -46,103 +133,450 @@ def build_huffman_tree(freq_table):
 
 def generate_huffman_code(node, current_node, code_map):
     """
-    Recursively traverses Huffman tree to generate codes for each symbol.
+    Traverses Huffman tree to generate codes for each symbol (left child 0, right child 1).
+    Uses an explicit stack instead of recursion, so deep trees cannot hit the recursion limit.
     Stores symbol → code mapping in code_map dictionary.
     """
     if node is None:
         return
-    
+
     if node.symbol is not None:
-        if current_node == "":
-            code_map[node.symbol] = "0"  # Edge case: only one symbol
-        else:
-            code_map[node.symbol] = current_node
+        code_map[node.symbol] = current_node or "0"  # Edge case: only one symbol
         return
-    
-    # Recursion to the left of root node
-    generate_huffman_code(node.left, current_node + "0", code_map)
 
-    # Recursion to the right of root node
-    generate_huffman_code(node.right, current_node + "1", code_map)
+    # Only internal nodes go on the stack; leaves get their code as soon as they are reached
+    stack = [(node, current_node)]
+    while stack:
+        node, code = stack.pop()
+        right = node.right
+        if right.symbol is None:
+            stack.append((right, code + "1"))
+        else:
+            code_map[right.symbol] = code + "1"
+
+        left = node.left
+        if left.symbol is None:
+            stack.append((left, code + "0"))
+        else:
+            code_map[left.symbol] = code + "0"
+
+
+def encode_symbols(symbols, code_map: dict) -> bitarray:
+    """
+    Encodes a sequence of symbols (bytes, or ints of a larger alphabet) with a Huffman code map.
+    The whole sequence is encoded in one bitarray.encode() call, so the per-symbol loop runs in C.
+    Returns: bitarray of the concatenated codes (unpadded).
+    """
+    codes = {symbol: bitarray(code) for symbol, code in code_map.items()}  # '0'/'1' strings → bitarrays
+
+    bits = bitarray()
+    bits.encode(codes, symbols)  # Append Huffman code for each symbol
+    return bits
 
 
 def encode_data_to_bitarray(data: bytes, code_map: dict) -> bytes:
     """
     Encodes input data using Huffman code map into a bitarray and packs it into bytes.
+    The whole buffer is encoded in one bitarray.encode() call, so the per-byte loop runs in C.
     Returns: bytes containing the compressed data.
     """
-    bits = bitarray()
-    for b in data:
-        bits.extend(code_map[b])  # Append Huffman code for each byte
+    bits = encode_symbols(data, code_map)
 
-    pad_len = (8 - len(bits) % 8) % 8  # Pad to make multiple of 8
-    bits.extend("0" * pad_len)
+    pad_len = bits.fill()  # Pad with zeros to make multiple of 8
 
     return bytes([pad_len]) + bits.tobytes()  # Prepend padding length
 
 
-def compress_huffman(data: bytes, ext: str = "txt") -> bytes: 
+def huffman_code_lengths(freq_table, max_length=None):
     """
-    Compresses input data using Huffman coding.
-    Returns: Bytes containing header + compressed payload.
+    Computes the Huffman code length of every symbol in a frequency table.
+    freq_table: symbol → count mapping, or a histogram (sequence of counts indexed by symbol,
+    e.g. from byte_histogram)
+    max_length: optional cap on the code length; when the unlimited code is deeper,
+    the optimal length-limited code is built instead (see limited_code_lengths)
+    Returns: dict mapping symbol → code length in bits
     """
-    if not data:
-        return b''
+    if not isinstance(freq_table, dict):
+        freq_table = histogram_table(freq_table)
 
-    # Preparing Header
-    header = bytearray(b"HUF1")
+    code_lengths = two_queue_code_lengths(freq_table)
 
-    # Building frequency table
-    freq_table = Counter(data)
+    if max_length is not None and code_lengths and max(code_lengths.values()) > max_length:
+        return limited_code_lengths(freq_table, max_length)
+    return code_lengths
 
-    # Encode Extension length and bytes
+
+def two_queue_code_lengths(freq_table):
+    """
+    Computes Huffman code lengths with the linear two-queue construction over flat arrays.
+    Leaves are sorted once by (frequency, symbol); merged nodes are created in non-decreasing
+    weight order, so they form a second sorted queue and no heap or node objects are needed.
+    On equal weights the leaf is taken first, which keeps the result deterministic and the
+    tree as shallow as possible. Depths are then read off the parent array in one backward pass.
+    Returns: dict mapping symbol → code length in bits
+    """
+    symbols = sorted(freq_table, key=lambda symbol: (freq_table[symbol], symbol))
+    count = len(symbols)
+    if count <= 1:
+        return {symbol: 1 for symbol in symbols}
+
+    # Nodes 0..count-1 are the leaves in sorted order, count..2*count-2 the merged nodes
+    weight = [freq_table[symbol] for symbol in symbols] + [0] * (count - 1)
+    parent = [0] * (2 * count - 1)
+    leaf = 0                  # Front of the leaf queue
+    merged = count            # Front of the merged queue
+    for node in range(count, 2 * count - 1):
+        for _ in range(2):
+            if leaf < count and (merged == node or weight[leaf] <= weight[merged]):
+                child = leaf
+                leaf += 1
+            else:
+                child = merged
+                merged += 1
+            parent[child] = node
+            weight[node] += weight[child]
+
+    # The root is the last node and every parent comes after its children
+    depth = [0] * (2 * count - 1)
+    for node in range(2 * count - 3, -1, -1):
+        depth[node] = depth[parent[node]] + 1
+
+    return {symbol: depth[index] for index, symbol in enumerate(symbols)}
+
+
+def limited_code_lengths(freq_table, max_length):
+    """
+    Computes optimal code lengths no longer than max_length bits with the package-merge algorithm.
+    Every level pairs up the cheapest items of the level below into packages and merges them with
+    the leaves again; a symbol's code length is the number of the 2n - 2 cheapest items at the
+    top level that contain it.
+    Returns: dict mapping symbol → code length in bits
+    """
+    symbols = sorted(freq_table, key=lambda symbol: (freq_table[symbol], symbol))
+    if len(symbols) == 1:
+        return {symbols[0]: 1}
+    if len(symbols) > 1 << max_length:
+        raise ValueError(f"{len(symbols)} symbols do not fit in codes of at most {max_length} bits")
+
+    leaves = [(freq_table[symbol], (symbol,)) for symbol in symbols]
+    items = leaves
+    for _ in range(max_length - 1):
+        packages = [(items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+                    for i in range(0, len(items) - 1, 2)]
+        items = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
+
+    code_lengths = Counter()
+    for _, contained in items[:2 * len(symbols) - 2]:
+        code_lengths.update(contained)
+    return dict(code_lengths)
+
+
+def canonical_huffman_code(code_lengths):
+    """
+    Derives canonical Huffman codes from code lengths (DEFLATE-style assignment).
+    Codes of the same length are consecutive integers in symbol order, so only the
+    lengths need to be stored. Runs in O(symbols + max length) without a tree or heap.
+    Returns: dict mapping symbol → code as a '0'/'1' string
+    """
+    if not code_lengths:
+        return {}
+
+    max_len = max(code_lengths.values())
+    bl_count = [0] * (max_len + 1)
+    for length in code_lengths.values():
+        if length < 1:
+            raise ValueError("Invalid code length table — zero-length code")
+        bl_count[length] += 1
+
+    # First code of every length
+    next_code = [0] * (max_len + 1)
+    code = 0
+    for length in range(1, max_len + 1):
+        code = (code + bl_count[length - 1]) << 1
+        next_code[length] = code
+
+    code_map = {}
+    for symbol in sorted(code_lengths):
+        length = code_lengths[symbol]
+        code = next_code[length]
+        if code >= 1 << length:
+            raise ValueError("Invalid code length table — oversubscribed prefix code")
+        next_code[length] = code + 1
+        code_map[symbol] = format(code, f"0{length}b")
+
+    return code_map
+
+
+def write_code_lengths(code_lengths, alphabet_size=256) -> bytes:
+    """
+    Serializes a code length table compactly:
+    max length (1 byte) + presence bitmap (1 bit per symbol) + 1 length byte per present symbol.
+    The max length byte is the longest code actually in the table (never more than a
+    max_code_length limit), so a decoder can size a 2**max_len lookup table from it.
+    Returns: bytes of the serialized table.
+    """
+    present = bitarray(alphabet_size)
+    present.setall(0)
+    for symbol in code_lengths:
+        present[symbol] = 1
+
+    max_len = max(code_lengths.values(), default=0)  # Empty for a block without back references
+    if max_len > 255:
+        raise ValueError("Code length too long to store")
+
+    lengths = bytes(code_lengths[symbol] for symbol in sorted(code_lengths))
+    return bytes([max_len]) + present.tobytes() + lengths
+
+
+def check_code_length_limit(max_code_length):
+    """Validates a max_code_length option (None means unlimited)."""
+    if max_code_length is not None and not MIN_CODE_LENGTH_LIMIT <= max_code_length <= 255:
+        raise ValueError(f"Maximum code length must be between {MIN_CODE_LENGTH_LIMIT} and 255 bits")
+
+
+def build_container_header(ext: str, block_size: int) -> bytes:
+    """
+    Builds the HUF3 container header.
+    Layout: b"HUF3" + extension length + extension + block size (4 bytes)
+    Returns: Header bytes.
+    """
     ext_bytes = ext.encode("utf-8")
     if len(ext_bytes) > 10:
         raise ValueError("Extension too long")
-    
-    header += bytes([len(ext_bytes)]) + ext_bytes
 
-    # Building header
+    if not 0 < block_size <= MAX_BLOCK_SIZE:
+        raise ValueError("Block size out of range")
 
-    k = len(freq_table)
-    header += k.to_bytes(2, 'big')
-    for symbol, freq in freq_table.items():
-        header += bytes([symbol]) + freq.to_bytes(8, 'big')
+    return b"HUF3" + bytes([len(ext_bytes)]) + ext_bytes + block_size.to_bytes(4, 'big')
 
-    # Build Payload
-    root = build_huffman_tree(freq_table)
-    code_map = {}
-    generate_huffman_code(root, "", code_map)
-    payload = encode_data_to_bitarray(data, code_map)
 
-    return bytes(header + payload)
+def coded_size(freq_table, code_lengths, table) -> int:
+    """
+    Computes the exact size of a Huffman-coded block body from its frequencies, without encoding it.
+    Returns: Size in bytes of code length table + padding length byte + payload.
+    """
+    bits = sum(freq * code_lengths[symbol] for symbol, freq in freq_table.items())
+    return len(table) + 1 + (bits + 7) // 8
 
-# -------------------------------------------------- Decompressing Functions ----------------------------------------------------------
 
-def load_frequency_table(source, from_bytes=False):
+def build_frame(block_type, raw_len, *parts) -> bytes:
     """
-    Loads the Huffman frequency table and payload from a compressed file or byte data.
-    Returns: freq_table (dict), offset (int), payload_bytes (bytes), extension (str)
+    Lays out one frame: block type (1 byte) + raw length (4 bytes) + body length (4 bytes) + body
+    Returns: Frame bytes.
     """
+    return b"".join([
+        bytes([block_type]),
+        raw_len.to_bytes(4, 'big'),
+        sum(len(part) for part in parts).to_bytes(4, 'big'),
+        *parts,
+    ])
 
-    if from_bytes:
-        data = source  # Use bytes directly
-    else:
-        with open(source, 'rb') as file:
-            data = file.read()  # Read file as bytes
-    
+
+def encode_lz77_body(block, search_depth: int, max_code_length=None) -> bytes:
+    """
+    DEFLATE-style coding of one block: an LZ77 parse whose literal/length symbols and distance
+    bucket codes get a canonical Huffman code each, with the buckets' extra bits kept raw.
+    Body layout: literal/length code length table + distance code length table
+    + literal/length stream bits (4 bytes) + distance stream bits (4 bytes)
+    + padding length + literal/length stream + distance stream + extra bits
+    Returns: Body bytes, or None when the parse found no back references.
+    """
+    litlens = []
+    distances = []
+    extra = bitarray()
+    for token in find_matches(block, search_depth):
+        if type(token) is int:
+            litlens.append(token)
+            continue
+
+        length, distance = token
+        code, extra_len, extra_value = length_bucket(length)
+        litlens.append(LENGTH_SYMBOL_BASE + code)
+        if extra_len:
+            extra += int2ba(extra_value, extra_len)
+
+        code, extra_len, extra_value = distance_bucket(distance)
+        distances.append(code)
+        if extra_len:
+            extra += int2ba(extra_value, extra_len)
+
+    if not distances:
+        return None
+
+    litlen_lengths = huffman_code_lengths(Counter(litlens), max_code_length)
+    dist_lengths = huffman_code_lengths(Counter(distances), max_code_length)
+    litlen_bits = encode_symbols(litlens, canonical_huffman_code(litlen_lengths))
+    dist_bits = encode_symbols(distances, canonical_huffman_code(dist_lengths))
+
+    bits = litlen_bits + dist_bits + extra
+    pad_len = bits.fill()
+
+    return b"".join([
+        write_code_lengths(litlen_lengths, LITLEN_ALPHABET_SIZE),
+        write_code_lengths(dist_lengths, DIST_ALPHABET_SIZE),
+        len(litlen_bits).to_bytes(4, 'big'),
+        len(dist_bits).to_bytes(4, 'big'),
+        bytes([pad_len]),
+        bits.tobytes(),
+    ])
+
+
+def encode_huffman_body(block, max_code_length=None) -> bytes:
+    """
+    Huffman-codes one block with its own canonical code length table.
+    Body layout: code length table + padding length + payload
+    Returns: Body bytes.
+    """
+    code_lengths = huffman_code_lengths(byte_histogram(block), max_code_length)
+    code_map = canonical_huffman_code(code_lengths)
+    return write_code_lengths(code_lengths) + encode_data_to_bitarray(block, code_map)
+
+
+def encode_block(block, search_depth: int = 0, max_code_length=None, codec: str = "huffman") -> bytes:
+    """
+    Codes one block independently of all others.
+    With the default huffman codec the block gets its own code length table. The coded size is
+    computed from the frequencies first; when coding would not save at least MIN_BLOCK_SAVING,
+    the block is stored raw instead and the encoding pass is skipped.
+    search_depth > 0 also tries an LZ77 parse (see encode_lz77_body) and keeps it if it is smaller.
+    max_code_length caps every code of the block; the table's max length byte records the actual maximum.
+    Any other registered codec compresses the block itself, with the same stored fallback
+    (and plain Huffman when the codec cannot code the block, e.g. LZ77 without any match).
+    Stored body layout: the raw bytes
+    Returns: Frame bytes.
+    """
+    stored_limit = len(block) * (1 - MIN_BLOCK_SAVING)
+    if codec != "huffman":
+        registered = get_codec(codec)
+        with stage("codec", len(block)):
+            body = registered.compress(block, search_depth=search_depth, max_code_length=max_code_length)
+        if body is not None:
+            if len(body) > stored_limit:
+                return build_frame(BLOCK_STORED, len(block), block)
+            return build_frame(registered.block_type, len(block), body)
+        search_depth = 0
+
+    # Building frequency table from a 256-entry byte histogram
+    with stage("count", len(block)):
+        freq_table = histogram_table(byte_histogram(block))
+
+    # Only code lengths are stored; the decoder derives the same canonical codes from them
+    with stage("code_lengths", len(block)):
+        code_lengths = huffman_code_lengths(freq_table, max_code_length)
+        table = write_code_lengths(code_lengths)
+        huffman_size = coded_size(freq_table, code_lengths, table)
+
+    lz77_body = None
+    if search_depth > 0:
+        with stage("lz77", len(block)):
+            lz77_body = encode_lz77_body(block, search_depth, max_code_length)
+    if lz77_body is not None and len(lz77_body) < huffman_size and len(lz77_body) <= stored_limit:
+        return build_frame(BLOCK_LZ77, len(block), lz77_body)
+
+    if huffman_size > stored_limit:
+        return build_frame(BLOCK_STORED, len(block), block)
+
+    with stage("encode", len(block)):
+        code_map = canonical_huffman_code(code_lengths)
+        payload = encode_data_to_bitarray(block, code_map)
+
+    return build_frame(BLOCK_HUFFMAN, len(block), table, payload)
+
+
+def build_block_index(entries, index_offset) -> bytes:
+    """
+    Serializes the block index written after the end marker.
+    Layout: per block frame offset (8 bytes) + raw length (4 bytes),
+    then entry count (4 bytes) + index offset (8 bytes) + b"HUFX"
+    Returns: Index bytes.
+    """
+    index = bytearray()
+    for frame_offset, raw_len in entries:
+        index += frame_offset.to_bytes(8, 'big') + raw_len.to_bytes(4, 'big')
+
+    index += len(entries).to_bytes(4, 'big') + index_offset.to_bytes(8, 'big') + INDEX_MAGIC
+    return bytes(index)
+
+
+def compress_huffman(data: bytes, ext: str = "txt", block_size: int = DEFAULT_BLOCK_SIZE, workers: int = 1,
+                     search_depth: int = 0, max_code_length: int = None, codec: str = "huffman",
+                     policy: str = DEFAULT_POLICY) -> bytes:
+    """
+    Compresses input data using canonical Huffman coding (HUF3 block format).
+    The input is cut into blocks of block_size bytes that are coded independently.
+    workers > 1 spreads the blocks over a process pool (None uses every core); the output is identical.
+    search_depth > 0 adds an LZ77 stage that tries up to that many earlier matches per position
+    (slower, much smaller output on text with repeated strings); 0 is plain Huffman.
+    max_code_length (MIN_CODE_LENGTH_LIMIT..255, e.g. 11-15) bounds every code, so decoders can use
+    single-level lookup tables of at most 2**max_code_length entries (each table's max length byte
+    holds its actual longest code); None leaves the codes unlimited.
+    codec: a registered codec name (see registry.codec_names), or "auto" to pick one by
+    trial-compressing a sample under policy ("ratio", "balanced" or "speed")
+    Returns: Bytes containing header + compressed blocks + end marker.
+    """
+    if not data:
+        return b''
+
+    header = build_container_header(ext, block_size)
+    check_code_length_limit(max_code_length)
+    check_codec(codec, policy)
+
+    view = memoryview(data)  # Slicing a memoryview does not copy the block
+    if codec == AUTO:
+        with stage("select", len(view)):
+            codec = choose_codec(view, policy, search_depth=search_depth, max_code_length=max_code_length)
+
+    spans = [(start, min(start + block_size, len(view))) for start in range(0, len(view), block_size)]
+    frames = encode_blocks(view, spans, workers, search_depth, max_code_length, codec)
+
+    # Record where every frame starts so decoders can jump straight to any block
+    with stage("container", len(view)):
+        entries = []
+        position = len(header)
+        for (start, end), frame in zip(spans, frames):
+            entries.append((position, end - start))
+            position += len(frame)
+
+        index = build_block_index(entries, position + len(END_FRAME))
+        return b"".join([header, *frames, END_FRAME, index])
+
+# -------------------------------------------------- Decompressing Functions ----------------------------------------------------------
+
+def read_signature(data, expected):
+    """
+    Validates the signature and reads the original file extension.
+    expected: tuple of accepted signatures
+    Returns: signature (bytes), extension (str), offset just past the extension (int)
+    """
     if len(data) < 6:
         raise ValueError("File too short to be a valid HUF file")  # File must be at least header + some data
 
-    signature = data[:4]
-    if signature != b"HUF1":
-        raise ValueError("Invalid file format — missing signature")  # Verify signature        
+    signature = bytes(data[:4])
+    if signature not in expected:
+        raise ValueError("Invalid file format — missing signature")  # Verify signature
 
     # Read the extension
     ext_len = data[4]
-    ext = data[5:5 + ext_len].decode('utf-8')
+    ext = bytes(data[5:5 + ext_len]).decode('utf-8')
+
+    return signature, ext, 5 + ext_len
+
+
+def load_frequency_table(source, from_bytes=False):
+    """
+    Loads the Huffman frequency table and payload from a HUF1 compressed file or byte data.
+    Returns: freq_table (dict), offset (int), payload_bytes (memoryview), extension (str)
+    """
+
+    if from_bytes:
+        data = memoryview(source)  # Parse in place; slices below do not copy
+    else:
+        data = map_file(source)  # Memory-map the file instead of reading it
+
+    signature, ext, offset = read_signature(data, (b"HUF1", b"HUF2"))
+    if signature != b"HUF1":
+        raise ValueError("HUF2 files store code lengths, not frequencies — use load_code_lengths")
 
-    offset = 5 + ext_len
     k = int.from_bytes(data[offset:offset + 2], 'big')  # Number of unique symbols
     offset += 2
 
@@ -160,66 +594,1008 @@ def load_frequency_table(source, from_bytes=False):
 
     return freq_table, offset, payload_bytes, ext
 
+
+def read_code_lengths(data, offset, alphabet_size=256):
+    """
+    Parses a code length table written by write_code_lengths.
+    Returns: code_lengths (dict), offset just past the table (int)
+    """
+    bitmap_len = (alphabet_size + 7) // 8
+    if len(data) < offset + 1 + bitmap_len:
+        raise ValueError("Truncated code length table")
+
+    max_len = data[offset]
+    present = bitarray()
+    present.frombytes(bytes(data[offset + 1:offset + 1 + bitmap_len]))
+    offset += 1 + bitmap_len
+
+    symbols = list(present.search(1))
+    if len(data) < offset + len(symbols):
+        raise ValueError("Truncated code length table")
+
+    code_lengths = {}
+    for symbol in symbols:
+        if symbol >= alphabet_size:
+            raise ValueError("Invalid code length table — symbol out of range")
+        length = data[offset]
+        if length > max_len:
+            raise ValueError("Invalid code length table — code longer than declared maximum")
+        code_lengths[symbol] = length
+        offset += 1
+
+    return code_lengths, offset
+
+
+def load_code_lengths(source, from_bytes=False):
+    """
+    Loads the canonical code length table and payload from a HUF2 compressed file or byte data.
+    Returns: code_lengths (dict), offset (int), payload_bytes (memoryview), extension (str)
+    """
+    if from_bytes:
+        data = memoryview(source)  # Parse in place; slices below do not copy
+    else:
+        data = map_file(source)  # Memory-map the file instead of reading it
+
+    signature, ext, offset = read_signature(data, (b"HUF1", b"HUF2"))
+    if signature != b"HUF2":
+        raise ValueError("HUF1 files store frequencies, not code lengths — use load_frequency_table")
+
+    code_lengths, offset = read_code_lengths(data, offset)
+    if not code_lengths:
+        raise ValueError("Empty code length table")
+
+    payload_bytes = data[offset:]
+    if len(payload_bytes) == 0:
+        raise ValueError("Missing compressed payload")  # Not even the padding length byte
+
+    return code_lengths, offset, payload_bytes, ext
+
+
+def build_decode_tree(code_map):
+    """
+    Converts a symbol → code mapping into a bitarray decodetree.
+    Codes may be given as '0'/'1' strings or bitarrays.
+    Returns: decodetree that resolves whole codes inside bitarray's C decoder.
+    """
+    return decodetree({symbol: bitarray(code) for symbol, code in code_map.items()})
+
+
 def decode_data(encoded_bits, root):
     """
-    Decodes Huffman-encoded bit string using the Huffman tree.
+    Decodes Huffman-encoded bits using the Huffman tree.
+    encoded_bits: bitarray (a '0'/'1' string is also accepted)
     Returns: Decoded bytes.
     """
     if not encoded_bits or root is None:
         return b''
 
+    if isinstance(encoded_bits, str):
+        encoded_bits = bitarray(encoded_bits)
+
     # Edge case: only one symbol in the tree
     if root.left is None and root.right is None:
-        return bytes([root.symbol] * len(encoded_bits))
+        return bytes([root.symbol]) * len(encoded_bits)
 
-    decoded_bytes = []          # List to store the decoded bytes
-    current = root              # Start traversal from the root of Huffman tree
+    # Flatten the tree into its code map and let bitarray walk the codes in C
+    code_map = {}
+    generate_huffman_code(root, "", code_map)
+    return bytes(encoded_bits.decode(build_decode_tree(code_map)))
+
+
+def decode_payload(payload_bytes, code_map):
+    """
+    Decodes a padded payload (padding length byte + packed bits) with a symbol → code mapping.
+    Returns: Decoded bytes.
+    """
+    # Extract padding info and reconstruct bitarray from payload
+    pad_len = payload_bytes[0]
+    bits = bitarray()
+    bits.frombytes(memoryview(payload_bytes)[1:])
+
+    if pad_len:
+        del bits[-pad_len:]
+
+    # Edge case: only one symbol, every bit is one occurrence of it
+    if len(code_map) == 1:
+        return bytes(code_map) * len(bits)
+
+    return bytes(bits.decode(build_decode_tree(code_map)))
+
+
+def parse_container_header(data):
+    """
+    Parses a HUF3 container header.
+    Returns: extension (str), block size (int), offset of the first frame (int)
+    """
+    _, ext, offset = read_signature(data, (b"HUF3",))
+    if len(data) < offset + 4:
+        raise ValueError("Truncated container header")
+
+    block_size = int.from_bytes(data[offset:offset + 4], 'big')
+    return ext, block_size, offset + 4
+
+
+def parse_frame_header(frame_header, block_size):
+    """
+    Parses and validates the 9-byte header of a non-end frame.
+    Writers never emit empty blocks, and the standard library decoders read a zero output limit as
+    "unlimited", so a zero raw length is rejected here rather than in every codec.
+    Returns: block type (int), raw length (int), body length (int)
+    """
+    block_type = frame_header[0]
+    raw_len = int.from_bytes(frame_header[1:5], 'big')
+    body_len = int.from_bytes(frame_header[5:9], 'big')
+
+    if raw_len == 0:
+        raise ValueError("Empty block — corrupted data")
+    if raw_len > block_size:
+        raise ValueError("Block larger than the declared block size")
+
+    return block_type, raw_len, body_len
 
-    for bit in encoded_bits:    # Iterate over each bit in the encoded bit string
-        if bit == "0":
-            current = current.left   # Move left for '0'
-        else:
-            current = current.right  # Move right for '1'
-        
-        if current.symbol is not None:  # Reached a leaf node (complete symbol)
-            decoded_bytes.append(current.symbol)  # Append the decoded byte
-            current = root                      # Reset to root for next symbol
-    
-    return bytes(decoded_bytes)
 
-def decompress_huffman(data: bytes) -> bytes:
+def iter_frames(data, offset, block_size):
     """
-    Decompresses Huffman-compressed bytes.
+    Walks the frames of an in-memory HUF3 container up to the end marker.
+    Yields: block type, raw length, body (memoryview into data)
+    """
+    view = memoryview(data)
+    while True:
+        if offset >= len(view):
+            raise ValueError("Truncated container — missing end marker")
+        if view[offset] == BLOCK_END:
+            return
+
+        if len(view) < offset + 9:
+            raise ValueError("Truncated frame header")
+        block_type, raw_len, body_len = parse_frame_header(view[offset:offset + 9], block_size)
+        offset += 9
+
+        if len(view) < offset + body_len:
+            raise ValueError("Truncated block")
+        yield block_type, raw_len, view[offset:offset + body_len]
+        offset += body_len
+
+
+def buffer_reader(data):
+    """
+    Wraps an in-memory container for the offset-based index and range readers.
+    Returns: read_at(offset, size) callable returning zero-copy slices of data.
+    """
+    view = memoryview(data)
+    return lambda offset, size: view[offset:offset + size]
+
+
+def file_reader(file):
+    """
+    Wraps a seekable binary file for the offset-based index and range readers.
+    Returns: read_at(offset, size) callable that seeks and reads only the requested bytes.
+    """
+    def read_at(offset, size):
+        file.seek(offset)
+        return read_exact(file, size)
+    return read_at
+
+
+def read_block_index(read_at, total_size, first_frame):
+    """
+    Reads the trailing block index of a HUF3 container of total_size bytes.
+    Returns: List of (frame offset, raw length), or None when the container carries no index.
+    """
+    if total_size < first_frame + INDEX_FOOTER_SIZE:
+        return None
+
+    footer = bytes(read_at(total_size - INDEX_FOOTER_SIZE, INDEX_FOOTER_SIZE))
+    if footer[-4:] != INDEX_MAGIC:
+        return None
+
+    count = int.from_bytes(footer[:4], 'big')
+    index_offset = int.from_bytes(footer[4:12], 'big')
+    if index_offset + count * INDEX_ENTRY_SIZE != total_size - INDEX_FOOTER_SIZE:
+        raise ValueError("Corrupted block index")
+
+    index = bytes(read_at(index_offset, count * INDEX_ENTRY_SIZE))
+    entries = []
+    for position in range(0, len(index), INDEX_ENTRY_SIZE):
+        frame_offset = int.from_bytes(index[position:position + 8], 'big')
+        raw_len = int.from_bytes(index[position + 8:position + 12], 'big')
+        if not first_frame <= frame_offset < index_offset:
+            raise ValueError("Corrupted block index")
+        entries.append((frame_offset, raw_len))
+
+    return entries
+
+
+def scan_block_index(read_at, first_frame, block_size):
+    """
+    Rebuilds the block index by hopping over frame headers, without decoding any block.
+    Used for containers written without a trailing index.
+    Returns: List of (frame offset, raw length)
+    """
+    entries = []
+    offset = first_frame
+    while True:
+        block_type = bytes(read_at(offset, 1))
+        if not block_type:
+            raise ValueError("Truncated container — missing end marker")
+        if block_type[0] == BLOCK_END:
+            return entries
+
+        frame_header = bytes(read_at(offset, 9))
+        if len(frame_header) < 9:
+            raise ValueError("Truncated frame header")
+        _, raw_len, body_len = parse_frame_header(frame_header, block_size)
+
+        entries.append((offset, raw_len))
+        offset += 9 + body_len
+
+
+def load_block_index(read_at, total_size, first_frame, block_size):
+    """
+    Returns: The container's block index, read from the trailer or rebuilt from the frame headers.
+    """
+    entries = read_block_index(read_at, total_size, first_frame)
+    if entries is None:
+        entries = scan_block_index(read_at, first_frame, block_size)
+    return entries
+
+
+def decode_symbols(bits, code_lengths):
+    """
+    Decodes a stream of canonical Huffman codes over any alphabet.
+    Returns: List of symbols (ints).
+    """
+    if not bits:
+        return []
+    if not code_lengths:
+        raise ValueError("Empty code length table")
+    return list(bits.decode(build_decode_tree(canonical_huffman_code(code_lengths))))
+
+
+def read_extra_bits(extra, position, count):
+    """
+    Reads a count-bit unsigned integer from the extra bits stream.
+    Returns: value (int), position just past it (int)
+    """
+    if not count:
+        return 0, position
+
+    end = position + count
+    if end > len(extra):
+        raise ValueError("Truncated extra bits")
+    return ba2int(extra[position:end]), end
+
+
+def decode_lz77_body(body, raw_len):
+    """
+    Decodes the body of an LZ77 frame written by encode_lz77_body.
+    Returns: Decoded bytes of the block.
+    """
+    litlen_lengths, offset = read_code_lengths(body, 0, LITLEN_ALPHABET_SIZE)
+    dist_lengths, offset = read_code_lengths(body, offset, DIST_ALPHABET_SIZE)
+    if len(body) < offset + 9:
+        raise ValueError("Truncated LZ77 block")
+
+    litlen_len = int.from_bytes(body[offset:offset + 4], 'big')
+    dist_len = int.from_bytes(body[offset + 4:offset + 8], 'big')
+    pad_len = body[offset + 8]
+
+    bits = bitarray()
+    bits.frombytes(bytes(body[offset + 9:]))
+    if pad_len:
+        del bits[-pad_len:]
+    if litlen_len + dist_len > len(bits):
+        raise ValueError("Truncated LZ77 block")
+
+    litlens = decode_symbols(bits[:litlen_len], litlen_lengths)
+    distances = iter(decode_symbols(bits[litlen_len:litlen_len + dist_len], dist_lengths))
+    extra = bits[litlen_len + dist_len:]
+
+    tokens = []
+    position = 0
+    try:
+        for symbol in litlens:
+            if symbol < LENGTH_SYMBOL_BASE:
+                tokens.append(symbol)
+                continue
+
+            code = symbol - LENGTH_SYMBOL_BASE
+            length, position = read_extra_bits(extra, position, LENGTH_EXTRA[code])
+            length += LENGTH_BASE[code]
+
+            code = next(distances)
+            distance, position = read_extra_bits(extra, position, DIST_EXTRA[code])
+            tokens.append((length, distance + DIST_BASE[code]))
+    except StopIteration:
+        raise ValueError("Missing distance code — corrupted data")
+
+    return expand_tokens(tokens, raw_len)
+
+
+def decode_huffman_body(body, raw_len):
+    """
+    Decodes the body of a Huffman frame written by encode_huffman_body.
+    Returns: Decoded bytes of the block.
+    """
+    code_lengths, offset = read_code_lengths(body, 0)
+    if not code_lengths:
+        raise ValueError("Empty code length table")
+
+    return decode_payload(body[offset:], canonical_huffman_code(code_lengths))
+
+
+def decode_block(block_type, raw_len, body):
+    """
+    Decodes the body of one frame with the codec registered for its block type.
+    Returns: Decoded bytes of the block.
+    """
+    with stage("decode", raw_len):
+        decoded = codec_for_block_type(block_type).decompress(body, raw_len)
+    if len(decoded) != raw_len:
+        raise ValueError("Block length mismatch — corrupted data")
+
+    return decoded
+
+
+# -------------------------------------------------- Codec Registration ----------------------------------------------------------
+
+register_codec("huffman", BLOCK_HUFFMAN,
+               lambda block, max_code_length=None, **_: encode_huffman_body(block, max_code_length),
+               decode_huffman_body)
+register_codec("stored", BLOCK_STORED, lambda block, **_: bytes(block), lambda body, raw_len: bytes(body),
+               selectable=False)
+register_codec("lz77", BLOCK_LZ77,
+               lambda block, search_depth=0, max_code_length=None, **_:
+                   encode_lz77_body(block, search_depth or DEFAULT_SEARCH_DEPTH, max_code_length),
+               decode_lz77_body, speed=LZ77_SPEED)
+
+
+def container_codecs(source):
+    """
+    Lists the codecs used by the blocks of a compressed file, reading only its header,
+    block index and the type byte of every frame.
+    source: compressed bytes/buffer, or a path to a .huff file
+    Returns: Codec names in order of first use (legacy HUF1/HUF2 files are plain Huffman)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            return read_container_codecs(file_reader(file), file.seek(0, os.SEEK_END))
+    return read_container_codecs(buffer_reader(source), len(source))
+
+
+def read_container_codecs(read_at, total_size):
+    """
+    Implements container_codecs over a read_at(offset, size) function.
+    Returns: Codec names in order of first use.
+    """
+    if total_size == 0:
+        return []
+
+    try:
+        head = bytes(read_at(0, 5))
+        if head[:4] in (b"HUF1", b"HUF2"):
+            return ["huffman"]
+
+        head += bytes(read_at(5, head[4] + 4)) if len(head) == 5 else b""
+        _, block_size, first_frame = parse_container_header(head)
+
+        names = []
+        for frame_offset, _ in load_block_index(read_at, total_size, first_frame, block_size):
+            block_type = bytes(read_at(frame_offset, 1))[0]
+            name = frame_codec_name(block_type, lambda size: bytes(read_at(frame_offset + 9, size)))
+            if name not in names:
+                names.append(name)
+        return names
+
+    except Exception as e:
+        raise ValueError(f"Decompression failed: {str(e)}")
+
+
+def decompress_huffman(data: bytes, workers: int = 1) -> bytes:
+    """
+    Decompresses Huffman-compressed bytes (HUF1, HUF2 or HUF3).
+    workers > 1 decodes HUF3 blocks in a process pool (None uses every core).
     Returns: Tuple of decoded bytes and original file extension.
     """
     if not data:
         raise ValueError("No data to decompress")
 
     try:
-        # Load frequency table, header info, payload, and file extension
-        freq_table, _, payload_bytes, ext = load_frequency_table(data, from_bytes=True)
+        signature = bytes(data[:4])
+        if signature == b"HUF3":
+            ext, block_size, offset = parse_container_header(data)
+            if resolve_workers(workers) > 1:
+                return decode_blocks_parallel(data, offset, block_size, workers), ext
+
+            blocks = [decode_block(*frame) for frame in iter_frames(data, offset, block_size)]
+            return b"".join(blocks), ext
 
-        # Rebuild Huffman tree from frequency table
-        root = build_huffman_tree(freq_table)
-        if root is None:
-            raise ValueError("Huffman tree could not be built — invalid compressed data.")
+        if signature == b"HUF1":
+            # Load frequency table, header info, payload, and file extension
+            freq_table, _, payload_bytes, ext = load_frequency_table(data, from_bytes=True)
 
-        # Extract padding info and reconstruct bitarray from payload
-        pad_len = payload_bytes[0]
-        bits = bitarray()
-        bits.frombytes(payload_bytes[1:])
+            # Rebuild Huffman tree from frequency table
+            root = build_huffman_tree(freq_table)
+            if root is None:
+                raise ValueError("Huffman tree could not be built — invalid compressed data.")
 
-        if pad_len: 
-            bits = bits[: -pad_len]
+            code_map = {}
+            generate_huffman_code(root, "", code_map)
+        else:
+            # HUF2: canonical codes follow directly from the stored lengths
+            code_lengths, _, payload_bytes, ext = load_code_lengths(data, from_bytes=True)
+            code_map = canonical_huffman_code(code_lengths)
 
-        # Decode the bitarray using the Huffman tree
-        decoded_data = decode_data(bits.to01(), root)
+        # Decode the bitarray using the code map
+        decoded_data = decode_payload(payload_bytes, code_map)
         return decoded_data, ext
-      
+
+    except Exception as e:
+        raise ValueError(f"Decompression failed: {str(e)}")
+
+
+# -------------------------------------------------- Streaming Functions ----------------------------------------------------------
+
+def read_exact(src, size):
+    """
+    Reads up to size bytes from a file-like object, retrying short reads until EOF.
+    Returns: bytes (shorter than size only at end of stream)
+    """
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = src.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_into_exact(src, view):
+    """
+    Fills a writable buffer from a file-like object, retrying short reads until EOF.
+    Uses readinto() when available so the data lands in the buffer without an extra copy.
+    Returns: Number of bytes read (less than len(view) only at end of stream)
+    """
+    filled = 0
+    while filled < len(view):
+        if hasattr(src, "readinto"):
+            count = src.readinto(view[filled:])
+        else:
+            chunk = src.read(len(view) - filled)
+            count = len(chunk) if chunk else 0
+            view[filled:filled + count] = chunk
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def iter_compress(src, ext: str = "txt", block_size: int = DEFAULT_BLOCK_SIZE, workers: int = 1, search_depth: int = 0,
+                  max_code_length: int = None, codec: str = "huffman", policy: str = DEFAULT_POLICY):
+    """
+    Compresses a readable binary file-like object lazily (HUF3 block format).
+    Input is read one block at a time (a batch of 2 blocks per worker when workers > 1),
+    so callers can forward each piece as soon as it is produced.
+    With codec="auto" the codec is chosen from a sample of the first block.
+    Yields: Container pieces — header, one frame per block, end marker, block index.
+    """
+    header = build_container_header(ext, block_size)
+    check_code_length_limit(max_code_length)
+    check_codec(codec, policy)
+
+    first = []
+    if codec == AUTO:
+        first = [read_exact(src, block_size)]
+        with stage("select", len(first[0])):
+            codec = choose_codec(first[0], policy, search_depth=search_depth, max_code_length=max_code_length)
+        first = [encode_block(first[0], search_depth, max_code_length, codec)] if first[0] else []
+
+    workers = resolve_workers(workers)
+    if workers > 1:
+        frames = iter_parallel_stream_frames(src, block_size, workers, search_depth, max_code_length, codec)
+    else:
+        blocks = iter(lambda: read_exact(src, block_size), b"")
+        frames = (encode_block(block, search_depth, max_code_length, codec) for block in blocks)
+
+    return iter_container(header, chain(first, frames))
+
+
+def iter_container(header, frames):
+    """
+    Lays out a HUF3 container incrementally: header, each frame as it is produced,
+    end marker, then the block index (only 12 bytes per block are kept for it).
+    Yields: Container pieces.
+    """
+    yield header
+    position = len(header)
+
+    entries = []
+    for frame in frames:
+        entries.append((position, int.from_bytes(frame[1:5], 'big')))
+        yield frame
+        position += len(frame)
+
+    yield END_FRAME
+    yield build_block_index(entries, position + len(END_FRAME))
+
+
+def compress_stream(src, dst, ext: str = "txt", block_size: int = DEFAULT_BLOCK_SIZE, workers: int = 1,
+                    search_depth: int = 0, max_code_length: int = None, codec: str = "huffman",
+                    policy: str = DEFAULT_POLICY) -> int:
+    """
+    Compresses a readable binary file-like object into a writable one (HUF3 block format).
+    The block index is written last, so dst does not need to be seekable.
+    Only one block is held in memory at a time (a batch of 2 blocks per worker when workers > 1),
+    so peak memory follows block_size, not the file size.
+    Returns: Number of compressed bytes written.
+    """
+    written = 0
+    for piece in iter_compress(src, ext, block_size, workers, search_depth, max_code_length, codec, policy):
+        dst.write(piece)
+        written += len(piece)
+    return written
+
+
+def iter_decompress(src):
+    """
+    Decompresses a readable binary file-like object lazily.
+    The header is parsed right away, so a bad file fails before anything is produced.
+    HUF3 input is then decoded block by block; legacy HUF1/HUF2 input is read whole.
+    Returns: Original file extension (str), iterator of decoded blocks
+    """
+    try:
+        head = read_exact(src, 5)
+        if head[:4] in (b"HUF1", b"HUF2"):
+            decoded, ext = decompress_huffman(head + src.read())
+            return ext, iter([decoded])
+
+        head += read_exact(src, head[4] + 4) if len(head) == 5 else b""
+        ext, block_size, _ = parse_container_header(head)
+
+    except Exception as e:
+        raise ValueError(f"Decompression failed: {str(e)}")
+
+    return ext, iter_stream_blocks(src, block_size)
+
+
+def iter_stream_blocks(src, block_size):
+    """
+    Reads and decodes the frames of a HUF3 stream up to the end marker.
+    Yields: Decoded bytes of each block.
+    """
+    try:
+        while True:
+            block_type = read_exact(src, 1)
+            if not block_type:
+                raise ValueError("Truncated container — missing end marker")
+            if block_type[0] == BLOCK_END:
+                return
+
+            frame_header = block_type + read_exact(src, 8)
+            if len(frame_header) < 9:
+                raise ValueError("Truncated frame header")
+            block_type, raw_len, body_len = parse_frame_header(frame_header, block_size)
+
+            body = read_exact(src, body_len)
+            if len(body) < body_len:
+                raise ValueError("Truncated block")
+            yield decode_block(block_type, raw_len, body)
+
+    except Exception as e:
+        raise ValueError(f"Decompression failed: {str(e)}")
+
+
+def decompress_stream(src, dst) -> str:
+    """
+    Decompresses a readable binary file-like object into a writable one.
+    HUF3 input is decoded block by block; legacy HUF1/HUF2 input is read whole.
+    Returns: Original file extension.
+    """
+    ext, blocks = iter_decompress(src)
+    for block in blocks:
+        dst.write(block)
+    return ext
+
+
+# -------------------------------------------------- File Functions ----------------------------------------------------------
+
+def map_file(path):
+    """
+    Memory-maps a whole file read-only.
+    The mapping stays alive as long as any view into it, and is unmapped once the last one is released.
+    Returns: memoryview over the file contents (empty for an empty file, which cannot be mapped).
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def release_pages(view, start, end):
+    """
+    Drops the pages of [start, end) of a memory-mapped file from the resident set once they
+    have been processed. They are clean file pages, so a later access just reads them back.
+    """
+    mapped = view.obj
+    if not isinstance(mapped, mmap.mmap) or not hasattr(mmap, "MADV_DONTNEED"):
+        return
+
+    start -= start % mmap.PAGESIZE  # madvise needs a page-aligned start
+    if end > start:
+        mapped.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+def encode_mapped_blocks(view, block_size, search_depth=0, max_code_length=None, codec="huffman"):
+    """
+    Encodes a memory-mapped input block by block, dropping each block's pages once it is encoded.
+    Yields: Frame bytes.
+    """
+    for start in range(0, len(view), block_size):
+        end = min(start + block_size, len(view))
+        yield encode_block(view[start:end], search_depth, max_code_length, codec)
+        release_pages(view, start, end)
+
+
+def report_progress(frames, progress, total):
+    """
+    Passes frames through, calling progress(done, total) after each one with the number of
+    input bytes encoded so far (read from the frame's raw length).
+    Yields: Frame bytes.
+    """
+    done = 0
+    for frame in frames:
+        yield frame
+        done += int.from_bytes(frame[1:5], 'big')
+        progress(done, total)
+
+
+def compress_file(src, dst, ext: str = None, block_size: int = DEFAULT_BLOCK_SIZE, workers: int = 1, progress=None,
+                  search_depth: int = 0, max_code_length: int = None, codec: str = "huffman",
+                  policy: str = DEFAULT_POLICY) -> int:
+    """
+    Compresses the file at path src into a HUF3 file at path dst.
+    ext defaults to the extension of src. The input is memory-mapped and every block is encoded
+    from a memoryview slice, written out, and its pages dropped before the next one, so peak
+    memory stays flat regardless of the file size. With workers > 1, batches of blocks are read into shared memory.
+    progress: optional callable(done, total), called after each block with input bytes encoded and the input size
+    Returns: Number of compressed bytes written.
+    """
+    if ext is None:
+        ext = os.path.splitext(os.fspath(src))[1][1:]
+
+    header = build_container_header(ext, block_size)
+    check_code_length_limit(max_code_length)
+    check_codec(codec, policy)
+    total = os.path.getsize(src)
+
+    if codec == AUTO:
+        view = map_file(src)
+        try:
+            with stage("select", len(view)):
+                codec = choose_codec(view, policy, search_depth=search_depth, max_code_length=max_code_length)
+        finally:
+            view.release()
+
+    with open(dst, 'wb') as out:
+        workers = resolve_workers(workers)
+        with open(src, 'rb') as file:
+            view = map_file(src) if workers <= 1 else None
+            try:
+                if view is None:
+                    frames = iter_parallel_stream_frames(file, block_size, workers, search_depth, max_code_length, codec)
+                else:
+                    frames = encode_mapped_blocks(view, block_size, search_depth, max_code_length, codec)
+                if progress is not None:
+                    frames = report_progress(frames, progress, total)
+
+                written = 0
+                for piece in iter_container(header, frames):
+                    out.write(piece)
+                    written += len(piece)
+                return written
+            finally:
+                if view is not None:
+                    view.release()
+
+
+def decode_file_block(path, frame_offset, index_raw_len, block_size):
+    """
+    Worker entry point: maps the compressed file itself and decodes the frame at frame_offset,
+    after checking it against the block index's raw length.
+    Returns: Decoded bytes of the block.
+    """
+    view = map_file(path)
+    try:
+        block_type, raw_len, body_len = parse_frame_header(view[frame_offset:frame_offset + 9], block_size)
+        if raw_len != index_raw_len:
+            raise ValueError("Block index does not match the frame — corrupted data")
+        return decode_block(block_type, raw_len, view[frame_offset + 9:frame_offset + 9 + body_len])
+    finally:
+        view.release()
+
+
+def decompress_file(src, dst, workers: int = 1, progress=None) -> str:
+    """
+    Decompresses the .huff file at path src into path dst.
+    The input is memory-mapped and parsed through memoryviews; each block is written as soon as it
+    is decoded and its input pages are dropped. With workers > 1, workers map the file themselves and decode batches of 2 blocks
+    per worker, so memory stays bounded by the block size.
+    progress: optional callable(done, total), called after each block with compressed bytes consumed and the input size
+    Returns: Original file extension.
+    """
+    view = map_file(src)
+    try:
+        if not view:
+            raise ValueError("No data to decompress")
+
+        total = len(view)
+        with open(dst, 'wb') as out:
+            if bytes(view[:4]) != b"HUF3":
+                decoded, ext = decompress_huffman(view)
+                out.write(decoded)
+                if progress is not None:
+                    progress(total, total)
+                return ext
+
+            try:
+                ext, block_size, first_frame = parse_container_header(view)
+                workers = resolve_workers(workers)
+                if workers <= 1:
+                    offset = first_frame
+                    for block_type, raw_len, body in iter_frames(view, first_frame, block_size):
+                        out.write(decode_block(block_type, raw_len, body))
+                        release_pages(view, offset, offset + 9 + len(body))
+                        offset += 9 + len(body)
+                        if progress is not None:
+                            progress(offset, total)
+                    if progress is not None:
+                        progress(total, total)  # End marker and block index
+                    return ext
+
+                entries = load_block_index(buffer_reader(view), len(view), first_frame, block_size)
+                offsets = [frame_offset for frame_offset, _ in entries]
+                raw_lens = [raw_len for _, raw_len in entries]
+                batch = 2 * workers
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for start in range(0, len(offsets), batch):
+                        chunk = offsets[start:start + batch]
+                        for decoded in pool.map(decode_file_block, repeat(src), chunk, raw_lens[start:start + batch],
+                                                repeat(block_size)):
+                            out.write(decoded)
+                        if progress is not None:
+                            done = offsets[start + batch] if start + batch < len(offsets) else total
+                            progress(done, total)
+                return ext
+
+            except Exception as e:
+                raise ValueError(f"Decompression failed: {str(e)}")
+    finally:
+        view.release()
+
+
+# -------------------------------------------------- Random Access Functions ----------------------------------------------------------
+
+def decode_range(read_at, entries, block_size, start, length):
+    """
+    Decodes bytes [start, start + length) using the block index, reading and decoding
+    only the blocks that overlap the range.
+    Returns: Decoded bytes (shorter than length if the range runs past the end)
+    """
+    end = start + length
+    pieces = []
+    block_start = 0
+    for frame_offset, raw_len in entries:
+        block_end = block_start + raw_len
+        if block_start >= end:
+            break
+
+        if block_end > start:
+            frame_header = bytes(read_at(frame_offset, 9))
+            block_type, frame_raw_len, body_len = parse_frame_header(frame_header, block_size)
+            if frame_raw_len != raw_len:
+                raise ValueError("Block index does not match the frame — corrupted data")
+
+            decoded = decode_block(block_type, raw_len, read_at(frame_offset + 9, body_len))
+            pieces.append(decoded[max(start - block_start, 0):end - block_start])
+
+        block_start = block_end
+
+    return b"".join(pieces)
+
+
+def decompress_range(source, start: int, length: int) -> bytes:
+    """
+    Decompresses only bytes [start, start + length) of the original file.
+    source: compressed bytes/buffer, or a path to a .huff file (only the header, index and
+    overlapping blocks are read from disk)
+    HUF3 containers are seekable through their block index; legacy HUF1/HUF2 input is decoded whole.
+    Returns: Decoded bytes (shorter than length if the range runs past the end)
+    """
+    if start < 0 or length < 0:
+        raise ValueError("Range start and length must be non-negative")
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            if read_exact(file, 4) != b"HUF3":
+                file.seek(0)
+                decoded, _ = decompress_huffman(file.read())
+                return decoded[start:start + length]
+
+            try:
+                file.seek(0)
+                head = read_exact(file, 5)
+                head += read_exact(file, head[4] + 4) if len(head) == 5 else b""
+                _, block_size, first_frame = parse_container_header(head)
+
+                total_size = file.seek(0, os.SEEK_END)
+                read_at = file_reader(file)
+                entries = load_block_index(read_at, total_size, first_frame, block_size)
+                return decode_range(read_at, entries, block_size, start, length)
+            except Exception as e:
+                raise ValueError(f"Decompression failed: {str(e)}")
+
+    if bytes(source[:4]) != b"HUF3":
+        decoded, _ = decompress_huffman(source)
+        return decoded[start:start + length]
+
+    try:
+        _, block_size, first_frame = parse_container_header(source)
+        read_at = buffer_reader(source)
+        entries = load_block_index(read_at, len(source), first_frame, block_size)
+        return decode_range(read_at, entries, block_size, start, length)
     except Exception as e:
         raise ValueError(f"Decompression failed: {str(e)}")
 
 
+# -------------------------------------------------- Parallel Functions ----------------------------------------------------------
+
+def resolve_workers(workers):
+    """
+    Normalizes a workers= option: None means one worker per CPU core.
+    Returns: Number of worker processes (at least 1).
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def encode_shared_block(shm_name, start, end, search_depth=0, max_code_length=None, codec="huffman"):
+    """
+    Worker entry point: encodes bytes [start, end) of a shared memory segment created by the parent.
+    Returns: Frame bytes.
+    """
+    shm = SharedMemory(name=shm_name)
+    block = shm.buf[start:end]
+    try:
+        return encode_block(block, search_depth, max_code_length, codec)
+    finally:
+        block.release()  # Exported views must be released before the segment can be closed
+        shm.close()
+
+
+def encode_blocks(view, spans, workers=1, search_depth=0, max_code_length=None, codec="huffman"):
+    """
+    Encodes the (start, end) spans of view as independent blocks, in order.
+    With workers > 1 the input is copied once into shared memory and the workers read their
+    blocks from it directly, instead of every block being pickled to a worker.
+    Returns: List of frame bytes.
+    """
+    workers = min(resolve_workers(workers), len(spans))
+    if workers <= 1:
+        return [encode_block(view[start:end], search_depth, max_code_length, codec) for start, end in spans]
+
+    shm = SharedMemory(create=True, size=len(view))
+    try:
+        shm.buf[:len(view)] = view
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            starts = [start for start, _ in spans]
+            ends = [end for _, end in spans]
+            return list(pool.map(encode_shared_block, repeat(shm.name), starts, ends,
+                                 repeat(search_depth), repeat(max_code_length), repeat(codec)))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def iter_parallel_stream_frames(src, block_size, workers, search_depth=0, max_code_length=None, codec="huffman"):
+    """
+    Reads a stream in batches of 2 blocks per worker straight into a reusable shared memory
+    segment and encodes each batch in a process pool.
+    Yields: Frame bytes in input order.
+    """
+    batch = 2 * workers
+    shm = SharedMemory(create=True, size=block_size * batch)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                spans = []
+                for index in range(batch):
+                    start = index * block_size
+                    with shm.buf[start:start + block_size] as slot:
+                        count = read_into_exact(src, slot)
+                    if count:
+                        spans.append((start, start + count))
+                    if count < block_size:
+                        break
+
+                if not spans:
+                    return
+
+                starts = [start for start, _ in spans]
+                ends = [end for _, end in spans]
+                yield from pool.map(encode_shared_block, repeat(shm.name), starts, ends,
+                                    repeat(search_depth), repeat(max_code_length), repeat(codec))
+
+                if spans[-1][1] - spans[-1][0] < block_size:
+                    return
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def decode_shared_block(src_name, frame_offset, index_raw_len, block_size, dst_name, dst_offset):
+    """
+    Worker entry point: decodes the frame at frame_offset of the shared input segment and writes
+    the result straight into the shared output segment at dst_offset.
+    The output was laid out from the block index, so a frame whose raw length differs from the
+    index entry is rejected instead of being written over its neighbours.
+    Returns: Number of bytes written.
+    """
+    src = SharedMemory(name=src_name)
+    dst = SharedMemory(name=dst_name)
+    try:
+        # Only this block's frame is copied out, so no view into the segment outlives close()
+        frame_header = bytes(src.buf[frame_offset:frame_offset + 9])
+        block_type, raw_len, body_len = parse_frame_header(frame_header, block_size)
+        if raw_len != index_raw_len:
+            raise ValueError("Block index does not match the frame — corrupted data")
+        body = bytes(src.buf[frame_offset + 9:frame_offset + 9 + body_len])
+
+        dst.buf[dst_offset:dst_offset + raw_len] = decode_block(block_type, raw_len, body)
+        return raw_len
+    finally:
+        src.close()
+        dst.close()
+
+
+def decode_blocks_parallel(data, first_frame, block_size, workers):
+    """
+    Decodes the blocks of a HUF3 container in a process pool.
+    The block index gives every block's frame offset and decoded size, so the output buffer is
+    preallocated and each worker writes its block at its final position.
+    Returns: Decoded bytes.
+    """
+    entries = load_block_index(buffer_reader(data), len(data), first_frame, block_size)
+
+    workers = min(resolve_workers(workers), len(entries))
+    if workers <= 1:
+        return b"".join(decode_block(*frame) for frame in iter_frames(data, first_frame, block_size))
+
+    dst_offsets = []
+    total = 0
+    for _, raw_len in entries:
+        dst_offsets.append(total)
+        total += raw_len
+
+    src = SharedMemory(create=True, size=len(data))
+    dst = SharedMemory(create=True, size=max(total, 1))
+    try:
+        src.buf[:len(data)] = data
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frame_offsets = [frame_offset for frame_offset, _ in entries]
+            raw_lens = [raw_len for _, raw_len in entries]
+            list(pool.map(decode_shared_block, repeat(src.name), frame_offsets, raw_lens, repeat(block_size),
+                          repeat(dst.name), dst_offsets))
+        return bytes(dst.buf[:total])
+    finally:
+        src.close()
+        src.unlink()
+        dst.close()
+        dst.unlink()
+
+
 # ---------------------------------------------------- Calculation Compression Ratio -----------------------------------------------
 
 def calculate_compression_ratio(original_size, compressed_size):
@@ -0,0 +1,79 @@
+"""
+Optional per-stage timing of the codec.
+
+The codec marks its stages with stage(name, size); they cost nothing unless the caller
+collects them:
+
+    stats = StageStats()
+    with collect_stages(stats):
+        compress_huffman(data, "txt")
+    stats.seconds["encode"], stats.bytes["encode"]
+
+Stages: select (auto codec trial), count (byte histogram), code_lengths (Huffman code lengths
+and table), lz77 (match search and its coding), encode (Huffman payload), codec (any other
+registered codec's compress), container (header, block index and output assembly) and
+decode (one block).
+Wall-clock time is measured with perf_counter. Collection is per thread (a ContextVar); blocks
+coded in worker processes (workers > 1) are not recorded, only the stages of the calling process.
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_active = ContextVar("huffman_stage_stats", default=None)
+
+
+class StageStats:
+    """
+    Accumulates wall-clock seconds, bytes and calls per stage.
+    callback: optional callback(stage, seconds, size) called after every stage, e.g. to feed a metrics system
+    """
+    def __init__(self, callback=None):
+        self.seconds = defaultdict(float)
+        self.bytes = defaultdict(int)
+        self.calls = defaultdict(int)
+        self.callback = callback
+
+    def add(self, name, seconds, size=0):
+        self.seconds[name] += seconds
+        self.bytes[name] += size
+        self.calls[name] += 1
+        if self.callback is not None:
+            self.callback(name, seconds, size)
+
+    def as_dict(self):
+        """Returns: {stage: {"seconds": float, "bytes": int, "calls": int}}"""
+        return {name: {"seconds": self.seconds[name], "bytes": self.bytes[name], "calls": self.calls[name]}
+                for name in self.seconds}
+
+
+@contextmanager
+def collect_stages(stats=None):
+    """
+    Records the codec stages run inside the with block (in this thread) into stats.
+    Yields: The StageStats (a new one if none is given).
+    """
+    stats = stats if stats is not None else StageStats()
+    token = _active.set(stats)
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def stage(name, size=0):
+    """Times the with block as one run of stage name over size input bytes, if stages are being collected."""
+    stats = _active.get()
+    if stats is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add(name, time.perf_counter() - start, size)
@@ -0,0 +1,168 @@
+"""
+LZ77 match finding for the DEFLATE-style block codec (BLOCK_LZ77 in huffman_full).
+
+find_matches turns a block into a token list: literal bytes and (length, distance) back
+references into the previous WINDOW_SIZE bytes. Candidates come from hash chains keyed on
+the next MIN_MATCH bytes; search_depth caps how many candidates are tried per position,
+trading speed for ratio. Lengths and distances are then mapped to DEFLATE's code buckets
+plus extra bits, so the entropy coder only sees small alphabets.
+"""
+
+from bisect import bisect_right
+
+
+MIN_MATCH = 3                # Shortest back reference worth coding
+MAX_MATCH = 258              # Longest back reference (DEFLATE's limit)
+WINDOW_SIZE = 32768          # Furthest distance a reference may reach back
+
+DEFAULT_SEARCH_DEPTH = 16    # Hash chain candidates tried per position
+MAX_INSERT_LENGTH = 32       # Positions inside longer matches are not added to the chains
+
+# Length buckets: symbol 256 + code covers lengths LENGTH_BASE[code] .. + 2**LENGTH_EXTRA[code] - 1
+LENGTH_BASE = [3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31,
+               35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258]
+LENGTH_EXTRA = [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2,
+                3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0]
+
+# Distance buckets: code covers distances DIST_BASE[code] .. + 2**DIST_EXTRA[code] - 1
+DIST_BASE = [1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193,
+             257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577]
+DIST_EXTRA = [0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6,
+              7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13]
+
+LENGTH_SYMBOL_BASE = 256                                 # Literal/length symbols: bytes, then length codes
+LITLEN_ALPHABET_SIZE = LENGTH_SYMBOL_BASE + len(LENGTH_BASE)
+DIST_ALPHABET_SIZE = len(DIST_BASE)
+
+# Length → bucket code, precomputed for every valid length (the last bucket is exactly 258)
+LENGTH_CODE = [0] * (MAX_MATCH + 1)
+for _code in range(len(LENGTH_BASE)):
+    for _length in range(LENGTH_BASE[_code], min(LENGTH_BASE[_code] + (1 << LENGTH_EXTRA[_code]), MAX_MATCH + 1)):
+        LENGTH_CODE[_length] = _code
+LENGTH_CODE[MAX_MATCH] = len(LENGTH_BASE) - 1
+
+
+def match_length(data, earlier, current, limit):
+    """
+    Length of the common prefix of data[earlier:] and data[current:], up to limit.
+    The first MIN_MATCH bytes are known to match (they share a hash chain key); the rest is
+    found by binary search over slice comparisons, which run in C.
+    Returns: Match length (int)
+    """
+    if data[earlier:earlier + limit] == data[current:current + limit]:
+        return limit
+
+    low, high = MIN_MATCH, limit  # data matches for low bytes, and not for high
+    while high - low > 1:
+        mid = (low + high) // 2
+        if data[earlier + low:earlier + mid] == data[current + low:current + mid]:
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def find_matches(data, search_depth: int = DEFAULT_SEARCH_DEPTH):
+    """
+    Greedy LZ77 parse of data with hash chains.
+    search_depth: hash chain candidates tried per position (more finds longer matches, but is slower)
+    Returns: List of tokens — an int for a literal byte, or a (length, distance) tuple for a back reference.
+    """
+    data = bytes(data)
+    size = len(data)
+    head = {}                 # MIN_MATCH-byte key → most recent position
+    prev = [-1] * size        # Position → previous position with the same key
+    tokens = []
+
+    position = 0
+    last_start = size - MIN_MATCH  # Last position with a full key
+    while position <= last_start:
+        key = data[position:position + MIN_MATCH]
+        candidate = head.get(key, -1)
+        prev[position] = candidate
+        head[key] = position
+
+        best_length = 0
+        best_distance = 0
+        limit = min(MAX_MATCH, size - position)
+        chain = search_depth
+        while candidate >= 0 and chain and position - candidate <= WINDOW_SIZE:
+            # A longer match must also agree on the byte just past the best one so far
+            if best_length < limit and data[candidate + best_length] == data[position + best_length]:
+                length = match_length(data, candidate, position, limit)
+                if length > best_length:
+                    best_length = length
+                    best_distance = position - candidate
+                    if length == limit:
+                        break
+            candidate = prev[candidate]
+            chain -= 1
+
+        if best_length < MIN_MATCH:
+            tokens.append(data[position])
+            position += 1
+            continue
+
+        tokens.append((best_length, best_distance))
+        end = position + best_length
+        if best_length <= MAX_INSERT_LENGTH:
+            for inner in range(position + 1, min(end, last_start + 1)):
+                key = data[inner:inner + MIN_MATCH]
+                prev[inner] = head.get(key, -1)
+                head[key] = inner
+        position = end
+
+    tokens.extend(data[position:])  # Tail shorter than a key
+    return tokens
+
+
+def length_bucket(length):
+    """
+    Maps a match length to its bucket.
+    Returns: code, number of extra bits, extra bits value
+    """
+    code = LENGTH_CODE[length]
+    return code, LENGTH_EXTRA[code], length - LENGTH_BASE[code]
+
+
+def distance_bucket(distance):
+    """
+    Maps a match distance to its bucket.
+    Returns: code, number of extra bits, extra bits value
+    """
+    code = bisect_right(DIST_BASE, distance) - 1
+    return code, DIST_EXTRA[code], distance - DIST_BASE[code]
+
+
+def expand_tokens(tokens, size):
+    """
+    Rebuilds the original bytes from literal and (length, distance) tokens.
+    Overlapping references (distance < length) repeat the referenced bytes, as in LZ77.
+    Stops as soon as the output would grow past size, so corrupted tokens cannot expand a
+    small body into far more memory than the block declares.
+    Returns: Decoded bytes.
+    """
+    out = bytearray()
+    for token in tokens:
+        if type(token) is int:
+            if len(out) >= size:
+                raise ValueError("Block length mismatch — corrupted data")
+            out.append(token)
+            continue
+
+        length, distance = token
+        if not 0 < distance <= len(out):
+            raise ValueError("Back reference before the start of the block")
+        if len(out) + length > size:
+            raise ValueError("Block length mismatch — corrupted data")
+
+        start = len(out) - distance
+        if distance >= length:
+            out += out[start:start + length]
+        else:
+            pattern = out[start:]
+            out += (pattern * (length // distance + 1))[:length]
+
+    if len(out) != size:
+        raise ValueError("Block length mismatch — corrupted data")
+    return bytes(out)
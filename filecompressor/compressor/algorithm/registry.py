@@ -0,0 +1,186 @@
+"""
+Registry of block codecs usable inside a HUF3 container.
+
+Every codec has a uniform interface — compress(block, **options) -> body, and
+decompress(body, raw_len) -> bytes — and a block type id that is written in the type byte
+of each frame, so a decoder picks the codec per block. huffman_full registers its own
+codecs (huffman, stored, lz77) on import; the stdlib codecs are registered here.
+
+choose_codec trial-compresses a sample of the input with every selectable codec and
+picks one under a speed/ratio policy; this is what codec="auto" does.
+"""
+
+import bz2
+import lzma
+import time
+import zlib
+from collections import namedtuple
+
+
+Codec = namedtuple("Codec", "name block_type compress decompress selectable speed")
+
+AUTO = "auto"                 # Codec name that asks for trial-based selection
+
+SAMPLE_SIZE = 64 * 1024       # Bytes trial-compressed per codec in auto mode
+SAMPLE_SLICES = 4             # The sample is taken from this many evenly spread places
+
+# Policy → minimum compression speed (MB/s) a codec must reach on the sample to be chosen.
+# Among the codecs that qualify, the one with the smallest output wins.
+POLICIES = {
+    "ratio": 0.0,       # Smallest output, however slow
+    "balanced": 4.0,
+    "speed": 16.0,
+}
+DEFAULT_POLICY = "balanced"
+
+_codecs = {}
+_block_types = {}
+_frame_namers = {}
+
+
+def register_codec(name, block_type, compress, decompress=None, selectable=True, speed=None, frame_name=None):
+    """
+    Adds a codec to the registry.
+    compress(block, **options): returns the frame body, or None if the codec cannot code this block
+    decompress(body, raw_len): returns the decoded bytes; None registers another encoder for a
+    block type whose decoder is already registered (e.g. one codec name per static dictionary)
+    selectable: whether it can be requested by name and picked by auto mode (False for
+    decode-only entries such as stored blocks)
+    speed: known compression speed in MB/s, if it is far below the others; auto mode does not
+    even trial a codec that is known to be too slow for the policy
+    frame_name(read_body): for a block type shared by several codecs, returns the name of the one
+    that wrote a frame; read_body(size) returns the first size bytes of the frame body
+    """
+    if name in _codecs:
+        raise ValueError(f"Codec {name} is already registered")
+    if not 0 < block_type < 256:
+        raise ValueError("Block type must fit in one byte and not be 0 (end marker)")
+
+    if decompress is None:
+        decompress = codec_for_block_type(block_type).decompress
+    elif block_type in _block_types:
+        raise ValueError(f"Block type {block_type} is already registered")
+
+    codec = Codec(name, block_type, compress, decompress, selectable, speed)
+    _codecs[name] = codec
+    _block_types.setdefault(block_type, codec)
+    if frame_name is not None:
+        _frame_namers[block_type] = frame_name
+
+
+def get_codec(name):
+    """
+    Looks a codec up by name.
+    Returns: Codec
+    """
+    codec = _codecs.get(name)
+    if codec is None or not codec.selectable:
+        raise ValueError(f"Unknown codec {name!r} — choose from {', '.join(codec_names())} or {AUTO!r}")
+    return codec
+
+
+def codec_for_block_type(block_type):
+    """
+    Looks a codec up by the block type stored in a frame.
+    Returns: Codec
+    """
+    try:
+        return _block_types[block_type]
+    except KeyError:
+        raise ValueError(f"Unknown block type {block_type}")
+
+
+def frame_codec_name(block_type, read_body):
+    """
+    Names the codec a frame was written with; the frame body is only read for block types
+    shared by several codecs (see register_codec).
+    Returns: Codec name
+    """
+    codec = codec_for_block_type(block_type)
+    frame_name = _frame_namers.get(block_type)
+    return frame_name(read_body) if frame_name is not None else codec.name
+
+
+def codec_names():
+    """Returns: Names of the codecs that can be requested for compression, in block type order."""
+    return sorted((name for name, codec in _codecs.items() if codec.selectable),
+                  key=lambda name: _codecs[name].block_type)
+
+
+def check_codec(name, policy=DEFAULT_POLICY):
+    """Validates a codec option (a registered name, or "auto" with a known policy)."""
+    if name == AUTO:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown codec policy {policy!r} — choose from {', '.join(POLICIES)}")
+    else:
+        get_codec(name)
+
+
+def take_sample(data, size=SAMPLE_SIZE, slices=SAMPLE_SLICES):
+    """
+    Takes up to size bytes from evenly spread places of data, so a file whose start differs
+    from its body (headers, embedded images) is still judged on its content.
+    Returns: bytes
+    """
+    if len(data) <= size:
+        return bytes(data)
+
+    piece = size // slices
+    stride = (len(data) - piece) // (slices - 1)
+    return b"".join(bytes(data[i * stride:i * stride + piece]) for i in range(slices))
+
+
+def choose_codec(data, policy=DEFAULT_POLICY, **options):
+    """
+    Trial-compresses a sample of data with every selectable codec and picks one under policy.
+    Codecs whose known speed is below the policy's minimum are skipped without a trial, and
+    codecs that cannot code the sample under options (compress returns None) are not candidates.
+    options are passed to each codec's compress (e.g. search_depth, max_code_length).
+    Returns: Codec name (str)
+    """
+    check_codec(AUTO, policy)
+    min_speed = POLICIES[policy]
+    sample = take_sample(data)
+    if not sample:
+        return "huffman"
+
+    trials = []
+    for codec in _codecs.values():
+        if not codec.selectable or (codec.speed is not None and codec.speed < min_speed):
+            continue
+        start = time.perf_counter()
+        body = codec.compress(sample, **options)
+        elapsed = time.perf_counter() - start
+        if body is None:
+            continue
+
+        size = len(body)
+        speed = len(sample) / (1024 * 1024) / elapsed if elapsed > 0 else float("inf")
+        trials.append((size, -speed, codec.name))
+
+    qualified = [trial for trial in trials if -trial[1] >= min_speed]
+    if qualified:
+        return min(qualified)[2]
+    return min(trials, key=lambda trial: trial[1])[2]  # Nothing is fast enough: take the fastest
+
+
+# -------------------------------------------------- Standard Library Codecs ----------------------------------------------------------
+
+def bounded_decompress(decoder, body, raw_len):
+    """
+    Runs a zlib/bz2/lzma decompressor object over a whole body, producing at most raw_len bytes,
+    so a corrupted block cannot expand without bound.
+    Returns: Decoded bytes.
+    """
+    decoded = decoder.decompress(body, raw_len)
+    if not decoder.eof:
+        raise ValueError("Block length mismatch — corrupted data")
+    return decoded
+
+
+register_codec("zlib", 4, lambda block, **_: zlib.compress(block, 6),
+               lambda body, raw_len: bounded_decompress(zlib.decompressobj(), body, raw_len))
+register_codec("bz2", 5, lambda block, **_: bz2.compress(block, 9),
+               lambda body, raw_len: bounded_decompress(bz2.BZ2Decompressor(), body, raw_len))
+register_codec("lzma", 6, lambda block, **_: lzma.compress(block, preset=6),
+               lambda body, raw_len: bounded_decompress(lzma.LZMADecompressor(), body, raw_len))
@@ -0,0 +1,102 @@
+"""
+Async streaming API endpoints (served best under ASGI, see filecompressor/asgi.py).
+
+    POST /api/compress/?name=report.csv     raw file as the request body -> .huff stream
+    POST /api/decompress/                   raw .huff as the request body -> original file stream
+
+The request body is read block by block and each compressed/decompressed block is sent
+as soon as it is ready. Codec work runs in the default thread pool executor, so the
+event loop keeps serving other clients while a large file is processed.
+"""
+
+import asyncio
+import os
+from functools import partial
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .algorithm import iter_compress, iter_decompress
+from .algorithm.huffman_full import DEFAULT_BLOCK_SIZE
+
+
+_EXHAUSTED = object()
+MAX_API_BLOCK_SIZE = 4 * 1024 * 1024   # Largest block_size a client may request; blocks are held in memory
+
+
+async def iterate_in_executor(iterator):
+    """
+    Drive a blocking iterator from the event loop, running each next() call in the executor.
+    Yields: The iterator's items.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await loop.run_in_executor(None, next, iterator, _EXHAUSTED)
+        if item is _EXHAUSTED:
+            return
+        yield item
+
+
+def attachment(filename):
+    """Content-Disposition header value for a download, with the file name quoted or encoded as needed."""
+    return content_disposition_header(True, filename)
+
+
+@csrf_exempt
+@require_POST
+async def api_compress(request):
+    """
+    Compresses the raw request body and streams the .huff container back.
+    Query parameters: name (original file name, used for the extension), block_size (optional, at most 4 MiB),
+    codec (optional, default COMPRESSION_CODEC; "auto" picks one from the first block under CODEC_POLICY)
+    """
+    name = request.GET.get("name", "file.bin")
+    base, ext = os.path.splitext(os.path.basename(name))
+    ext = ext[1:]
+
+    loop = asyncio.get_running_loop()
+    try:
+        block_size = int(request.GET.get("block_size", DEFAULT_BLOCK_SIZE))
+        if block_size > MAX_API_BLOCK_SIZE:
+            raise ValueError(f"block_size must be at most {MAX_API_BLOCK_SIZE} bytes")
+        codec = request.GET.get("codec", settings.COMPRESSION_CODEC)
+        # Validates the options, and in auto mode reads the first block to choose the codec
+        pieces = await loop.run_in_executor(None, partial(iter_compress, request, ext, block_size,
+                                                          codec=codec, policy=settings.CODEC_POLICY))
+        header = await loop.run_in_executor(None, next, pieces)
+    except ValueError as e:
+        return JsonResponse({"error": f"Compression failed: {e}"}, status=400)
+
+    async def body():
+        yield header
+        async for piece in iterate_in_executor(pieces):
+            yield piece
+
+    response = StreamingHttpResponse(body(), content_type="application/octet-stream")
+    response["Content-Disposition"] = attachment(f"{base}({ext}).huff")
+    return response
+
+
+@csrf_exempt
+@require_POST
+async def api_decompress(request):
+    """
+    Decompresses the raw .huff request body and streams the original file back.
+    Query parameters: name (uploaded file name, used for the download name)
+    The original extension is also returned in the X-Original-Extension header.
+    """
+    try:
+        ext, blocks = await asyncio.get_running_loop().run_in_executor(None, iter_decompress, request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    name = os.path.splitext(os.path.basename(request.GET.get("name", "file.huff")))[0]
+    name = name.replace(f"({ext})", "")
+
+    response = StreamingHttpResponse(iterate_in_executor(blocks), content_type="application/octet-stream")
+    response["Content-Disposition"] = attachment(f"{name}.{ext}" if ext else name)
+    response["X-Original-Extension"] = ext
+    return response
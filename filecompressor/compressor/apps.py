@@ -1,6 +1,31 @@
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def serving_requests():
+    """
+    Whether this process is a web server: a WSGI/ASGI server, or runserver's serving process
+    (not its autoreloader). manage.py commands such as migrate, test or shell are not.
+    """
+    program = os.path.basename(sys.argv[0]) if sys.argv else ""
+    if program not in ("manage.py", "django-admin", "django-admin.py", "__main__.py"):
+        return True
+    if "runserver" not in sys.argv:
+        return False
+    return os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
 
 
 class CompressorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'compressor'
+
+    def ready(self):
+        # Resume jobs orphaned by a previous server process now rather than at the next upload.
+        # A thread, because the database should not be queried while apps are still loading.
+        if settings.JOB_RESUME_ON_START and serving_requests():
+            from .jobs import start_workers
+            threading.Thread(target=start_workers, name="huffman-job-resume", daemon=True).start()
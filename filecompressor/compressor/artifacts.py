@@ -0,0 +1,120 @@
+"""
+Disk-backed store for compression and decompression results.
+
+Results are written once under ARTIFACT_ROOT and referenced from the session by id,
+so sessions stay small and downloads are streamed straight from disk.
+Artifacts expire after ARTIFACT_TTL seconds, and the oldest ones are evicted once
+the store grows past ARTIFACT_MAX_BYTES.
+"""
+
+import os
+import re
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+
+ARTIFACT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")  # uuid4().hex; also blocks path traversal
+
+
+def artifact_root():
+    """Return the artifact directory, creating it on first use."""
+    root = Path(settings.ARTIFACT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def artifact_path(artifact_id):
+    """
+    Resolve an artifact id to its file.
+    Returns: Path, or None if the id is invalid or the artifact has expired or been evicted.
+    """
+    if not artifact_id or not ARTIFACT_ID_PATTERN.match(artifact_id):
+        return None
+
+    path = artifact_root() / artifact_id
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    if age > settings.ARTIFACT_TTL:
+        path.unlink(missing_ok=True)
+        return None
+    return path
+
+
+def save_artifact(data):
+    """
+    Write data to a new artifact and evict old ones if needed.
+    The file is written under a temporary name and renamed, so readers never see partial data.
+    Returns: Artifact id (str)
+    """
+    root = artifact_root()
+    artifact_id = uuid.uuid4().hex
+    partial = root / f"{artifact_id}.part"
+
+    with open(partial, "wb") as file:
+        file.write(data)
+    os.replace(partial, root / artifact_id)
+
+    evict_artifacts(keep=artifact_id)
+    return artifact_id
+
+
+def save_artifact_from_file(source):
+    """
+    Publish an existing file (e.g. a cached result) as a new artifact.
+    The file is hard-linked when possible, so nothing is copied; otherwise it is copied.
+    Returns: Artifact id (str)
+    """
+    root = artifact_root()
+    artifact_id = uuid.uuid4().hex
+    partial = root / f"{artifact_id}.part"
+
+    try:
+        os.link(source, partial)
+    except OSError:
+        shutil.copyfile(source, partial)  # Different filesystem, or links not supported
+    os.replace(partial, root / artifact_id)
+    os.utime(root / artifact_id)  # TTL counts from publication, not from the source's mtime
+
+    evict_artifacts(keep=artifact_id)
+    return artifact_id
+
+
+def evict_artifacts(keep=None):
+    """
+    Delete expired artifacts, then the oldest ones until the store fits ARTIFACT_MAX_BYTES.
+    keep: id of an artifact that must survive (the one just written)
+    """
+    now = time.time()
+    live = []
+    total = 0
+
+    for path in artifact_root().iterdir():
+        if not ARTIFACT_ID_PATTERN.match(path.name):
+            continue  # Partial writes and foreign files are left alone
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue  # Removed by a concurrent request
+
+        if now - stat.st_mtime > settings.ARTIFACT_TTL and path.name != keep:
+            path.unlink(missing_ok=True)
+            continue
+
+        live.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    # Oldest first
+    for _, size, path in sorted(live, key=lambda item: item[0]):
+        if total <= settings.ARTIFACT_MAX_BYTES:
+            break
+        if path.name == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
@@ -0,0 +1,243 @@
+"""
+Local background runner for large compression and decompression jobs.
+
+Jobs are rows in the Job table (sqlite), and an in-process thread pool runs them, so no
+external broker is needed. The upload is stashed under JOB_ROOT when the job is submitted,
+progress is written back to the row after each block, and the result is published to the
+artifact store for download.
+
+Every job row records the process that owns it and a heartbeat, refreshed with each progress
+update. The pool starts with each server process (see CompressorConfig.ready) and takes over
+only jobs whose owner is gone (no such process, or silent for JOB_LEASE_SECONDS), so several
+server processes can share the table. A worker claims its job with a conditional update from
+queued to running, so a job runs at most once.
+"""
+
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from . import metrics
+from .algorithm import collect_stages, compress_file, container_codecs, decompress_file
+from .artifacts import save_artifact_from_file
+from .models import Job
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def job_root():
+    """Return the directory holding job inputs and partial outputs, creating it on first use."""
+    root = Path(settings.JOB_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def input_path(job_id):
+    """Path of the stashed upload of a job."""
+    return job_root() / f"{job_id}.in"
+
+
+def get_pool():
+    """
+    Return the process-wide worker pool, starting it (and resuming unfinished jobs) on first use.
+    Returns: ThreadPoolExecutor
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="huffman-job")
+            try:
+                resume_jobs(pool)
+            except Exception:
+                pool.shutdown(wait=False)  # Not kept, so the next call tries again
+                raise
+            _pool = pool
+        return _pool
+
+
+def process_alive(pid):
+    """
+    Whether a process with this id exists on this machine.
+    Signal 0 only checks for existence on POSIX; on Windows os.kill would end the process,
+    so there every owner counts as alive and only the heartbeat lease applies.
+    """
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, but belongs to another user
+    return True
+
+
+def is_orphaned(job):
+    """
+    Whether no live process holds a queued or running job: it has no owner (rows from before owners
+    were recorded), its owner's pid is now this process (so the owner is gone and the pid reused),
+    the owner has exited, or it has not sent a heartbeat for JOB_LEASE_SECONDS.
+    """
+    if job.owner_pid is None or job.owner_pid == os.getpid():
+        return True
+    if job.heartbeat_at is None or (timezone.now() - job.heartbeat_at).total_seconds() > settings.JOB_LEASE_SECONDS:
+        return True
+    return not process_alive(job.owner_pid)
+
+
+def start_workers():
+    """
+    Starts the worker pool when a server process starts (see CompressorConfig.ready), so jobs
+    orphaned by a previous process are resumed without waiting for the next upload.
+    """
+    try:
+        get_pool()
+    except DatabaseError:
+        pass  # Job table not migrated yet; jobs are resumed when the pool starts for the first upload
+    finally:
+        connection.close()
+
+
+def resume_jobs(pool):
+    """
+    Take over the queued or running jobs of dead processes and requeue them on pool,
+    failing those whose input is gone. Jobs of live processes are left to them.
+    """
+    for job in Job.objects.filter(status__in=[Job.QUEUED, Job.RUNNING]):
+        if not is_orphaned(job):
+            continue
+
+        # Compare-and-set, so two processes starting at once can't both take the job over
+        current = Job.objects.filter(pk=job.pk, status=job.status, owner_pid=job.owner_pid,
+                                     heartbeat_at=job.heartbeat_at)
+        if input_path(job.pk).exists():
+            if current.update(status=Job.QUEUED, owner_pid=os.getpid(), heartbeat_at=timezone.now(),
+                              bytes_done=0, started_at=None):
+                pool.submit(run_job, job.pk)
+        else:
+            current.update(status=Job.FAILED, error="Input lost after a restart", finished_at=timezone.now())
+
+
+def stash_upload(uploaded_file, path):
+    """
+    Keep the upload past the end of the request.
+    Spooled temporary files are hard-linked when possible, otherwise the content is copied.
+    """
+    if hasattr(uploaded_file, "temporary_file_path"):
+        try:
+            os.link(uploaded_file.temporary_file_path(), path)
+            return
+        except OSError:
+            pass  # Different filesystem, or links not supported
+
+    uploaded_file.seek(0)
+    with open(path, "wb") as file:
+        shutil.copyfileobj(uploaded_file, file)
+
+
+def submit_job(operation, uploaded_file):
+    """
+    Create a job for an upload and queue it on the worker pool.
+    Returns: Job
+    """
+    pool = get_pool()  # Started first, so resuming old jobs can't pick this one up as well
+    job = Job.objects.create(operation=operation, file_name=uploaded_file.name, bytes_total=uploaded_file.size,
+                             owner_pid=os.getpid(), heartbeat_at=timezone.now())
+    stash_upload(uploaded_file, input_path(job.pk))
+    pool.submit(run_job, job.pk)
+    return job
+
+
+def progress_reporter(job_id):
+    """
+    Build a progress(done, total) callback for the codec that writes to the job row (with a
+    heartbeat) at most once per JOB_PROGRESS_INTERVAL seconds (and always for the last block).
+    Returns: Callable
+    """
+    last = 0.0
+
+    def progress(done, total):
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= settings.JOB_PROGRESS_INTERVAL or done >= total:
+            last = now
+            Job.objects.filter(pk=job_id).update(bytes_done=done, bytes_total=total, heartbeat_at=timezone.now())
+
+    return progress
+
+
+def claim_job(job_id):
+    """
+    Atomically moves a queued job to running, owned by this process.
+    Returns: Whether this worker got the job (False if another worker already claimed it).
+    """
+    now = timezone.now()
+    return Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+        status=Job.RUNNING, owner_pid=os.getpid(), started_at=now, heartbeat_at=now) == 1
+
+
+def run_job(job_id):
+    """
+    Worker entry point: runs the codec on the stashed upload and publishes the result as an artifact.
+    Does nothing unless it can claim the job. Failures are recorded on the job instead of being raised.
+    """
+    if not claim_job(job_id):
+        connection.close()
+        return
+
+    source = input_path(job_id)
+    output = job_root() / f"{job_id}.out"
+    try:
+        job = Job.objects.get(pk=job_id)
+        progress = progress_reporter(job_id)
+        name, ext = os.path.splitext(job.file_name)
+        start = time.perf_counter()
+
+        if job.operation == Job.COMPRESS:
+            ext = ext[1:]
+            with collect_stages() as stages:
+                compress_file(source, output, ext, workers=settings.JOB_CODEC_WORKERS, progress=progress,
+                              codec=settings.COMPRESSION_CODEC, policy=settings.CODEC_POLICY)
+            result_name = f"{name}({ext}).huff"
+            codec = ", ".join(container_codecs(output))
+        else:
+            codec = ", ".join(container_codecs(source))
+            with collect_stages() as stages:
+                ext = decompress_file(source, output, workers=settings.JOB_CODEC_WORKERS, progress=progress)
+            result_name = f"{name.replace(f'({ext})', '')}.{ext}"
+
+        result_size = output.stat().st_size
+        sizes = (job.bytes_total, result_size) if job.operation == Job.COMPRESS else (result_size, job.bytes_total)
+        metrics.observe_operation(job.operation, time.perf_counter() - start, *sizes, stages)
+        artifact = save_artifact_from_file(output)
+        Job.objects.filter(pk=job_id).update(status=Job.DONE, artifact=artifact, result_name=result_name,
+                                             result_size=result_size, codec=codec, finished_at=timezone.now())
+
+    except Exception as e:
+        Job.objects.filter(pk=job_id).update(status=Job.FAILED, error=str(e), finished_at=timezone.now())
+
+    finally:
+        source.unlink(missing_ok=True)
+        output.unlink(missing_ok=True)
+        connection.close()  # Each worker thread has its own connection; don't leave it open between jobs
+
+
+def job_eta(job):
+    """
+    Estimate the seconds left from the average throughput since the job started.
+    Returns: Seconds (float), or None before the first block is done.
+    """
+    if job.status != Job.RUNNING or not job.started_at or not job.bytes_done:
+        return None
+
+    elapsed = (timezone.now() - job.started_at).total_seconds()
+    return elapsed * (job.bytes_total - job.bytes_done) / job.bytes_done
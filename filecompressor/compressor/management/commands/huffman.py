@@ -0,0 +1,196 @@
+"""
+Batch compression/decompression of whole directory trees.
+
+    python manage.py huffman compress ../sample/input ../sample/output
+    python manage.py huffman decompress ../sample/output ../restored --workers 4
+    python manage.py huffman compress ../sample/input ../sample/output --search-depth 16
+    python manage.py huffman compress ../sample/input ../sample/output --codec auto --policy ratio
+
+Compressed files are named like the web app names them: name.ext -> name(ext).huff.
+Outputs that are already up to date are skipped (by mtime, or by content hash with --check hash).
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from compressor.algorithm import (
+    AUTO,
+    POLICIES,
+    codec_names,
+    compress_file,
+    decompress_file,
+    calculate_compression_ratio,
+)
+from compressor.algorithm.huffman_full import DEFAULT_BLOCK_SIZE, read_signature
+
+
+MANIFEST_NAME = ".huffman-manifest.json"  # Source hashes of the last run, for --check hash
+HUFF_NAME_PATTERN = re.compile(r"^(?P<name>.*)\((?P<ext>[^()]*)\)\.huff$")
+
+
+def file_digest(path):
+    """Return the BLAKE2b hex digest of a file, read in 1 MiB chunks."""
+    digest = hashlib.blake2b()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compressed_name(filename):
+    """name.ext -> name(ext).huff"""
+    name, ext = os.path.splitext(filename)
+    return f"{name}({ext[1:]}).huff"
+
+
+def decompressed_name(path):
+    """name(ext).huff -> name.ext, using the extension stored in the file header."""
+    with open(path, "rb") as file:
+        head = file.read(15)  # Signature + extension length + at most 10 extension bytes
+    _, ext, _ = read_signature(head, (b"HUF1", b"HUF2", b"HUF3"))
+
+    filename = os.path.basename(path)
+    match = HUFF_NAME_PATTERN.match(filename)
+    name = match.group("name") if match else os.path.splitext(filename)[0]
+    return f"{name}.{ext}" if ext else name
+
+
+def run_job(job):
+    """
+    Worker entry point: compresses or decompresses one file.
+    Returns: (relative path, input size, output size, seconds, error message or None)
+    """
+    mode, src, dst, rel, block_size, search_depth, max_code_length, codec, policy = job
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if mode == "compress":
+            compress_file(src, dst, block_size=block_size, search_depth=search_depth,
+                          max_code_length=max_code_length, codec=codec, policy=policy)
+        else:
+            decompress_file(src, dst)
+    except Exception as e:
+        return rel, os.path.getsize(src), 0, time.perf_counter() - start, str(e)
+
+    return rel, os.path.getsize(src), os.path.getsize(dst), time.perf_counter() - start, None
+
+
+def throughput(size, seconds):
+    """Format size / seconds as MB/s."""
+    return f"{size / (1024 * 1024) / seconds:.2f} MB/s" if seconds > 0 else "-"
+
+
+class Command(BaseCommand):
+    help = "Compress or decompress every file of a directory tree with the Huffman codec."
+
+    def add_arguments(self, parser):
+        parser.add_argument("mode", choices=["compress", "decompress"])
+        parser.add_argument("source", help="Input directory")
+        parser.add_argument("destination", help="Output directory (created if missing)")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Parallel worker processes (default: one per CPU core)")
+        parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                            help="Bytes per independently coded block when compressing")
+        parser.add_argument("--search-depth", type=int, default=0,
+                            help="LZ77 hash chain candidates tried per position (0 = plain Huffman)")
+        parser.add_argument("--max-code-length", type=int, default=None,
+                            help="Limit Huffman codes to this many bits (9-255, default: unlimited)")
+        parser.add_argument("--codec", choices=codec_names() + [AUTO], default="huffman",
+                            help="Block codec; auto picks one per file by trial-compressing a sample")
+        parser.add_argument("--policy", choices=list(POLICIES), default="balanced",
+                            help="Speed/ratio trade-off used by --codec auto")
+        parser.add_argument("--check", choices=["mtime", "hash"], default="mtime",
+                            help="How to detect unchanged inputs whose output can be skipped")
+        parser.add_argument("--force", action="store_true", help="Rewrite every output")
+
+    def handle(self, *args, **options):
+        mode = options["mode"]
+        source = os.path.abspath(options["source"])
+        destination = os.path.abspath(options["destination"])
+        if not os.path.isdir(source):
+            raise CommandError(f"{source} is not a directory")
+
+        manifest_path = os.path.join(destination, MANIFEST_NAME)
+        manifest = {}
+        if options["check"] == "hash" and os.path.exists(manifest_path):
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+
+        jobs, skipped, digests = self.collect_jobs(mode, source, destination, options, manifest)
+        workers = min(options["workers"] or os.cpu_count() or 1, max(len(jobs), 1))
+
+        self.stdout.write(f"{len(jobs)} file(s) to {mode}, {skipped} unchanged, {workers} worker(s)")
+
+        start = time.perf_counter()
+        total_in = total_out = failures = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rel, size_in, size_out, seconds, error in pool.map(run_job, jobs):
+                if error:
+                    failures += 1
+                    digests.pop(rel, None)
+                    self.stderr.write(f"FAILED {rel}: {error}")
+                    continue
+
+                total_in += size_in
+                total_out += size_out
+                ratio = calculate_compression_ratio(*((size_in, size_out) if mode == "compress" else (size_out, size_in)))
+                self.stdout.write(f"{rel}: {size_in} -> {size_out} bytes ({ratio}%) in {seconds:.2f}s, {throughput(size_in, seconds)}")
+        elapsed = time.perf_counter() - start
+
+        if options["check"] == "hash":
+            os.makedirs(destination, exist_ok=True)
+            with open(manifest_path, "w") as file:
+                json.dump({**manifest, **digests}, file, indent=2, sort_keys=True)
+
+        summary = (f"Done: {len(jobs) - failures} file(s), {total_in} -> {total_out} bytes "
+                   f"in {elapsed:.2f}s, {throughput(total_in, elapsed)} aggregate")
+        self.stdout.write(self.style.SUCCESS(summary) if not failures else self.style.WARNING(summary))
+        if failures:
+            raise CommandError(f"{failures} file(s) failed")
+
+    def collect_jobs(self, mode, source, destination, options, manifest):
+        """
+        Walk the source tree and build one job per file whose output is missing or stale.
+        Returns: jobs, number of skipped files, {relative path: source digest} (hash mode only)
+        """
+        jobs = []
+        skipped = 0
+        digests = {}
+
+        for root, _, files in os.walk(source):
+            for filename in sorted(files):
+                src = os.path.join(root, filename)
+                rel = os.path.relpath(src, source)
+                if mode == "decompress" and not filename.endswith(".huff"):
+                    continue
+
+                if mode == "compress":
+                    out_name = compressed_name(filename)
+                else:
+                    try:
+                        out_name = decompressed_name(src)
+                    except ValueError as e:
+                        self.stderr.write(f"SKIPPED {rel}: {e}")
+                        continue
+                dst = os.path.join(destination, os.path.dirname(rel), out_name)
+
+                if options["check"] == "hash":
+                    digests[rel] = file_digest(src)
+                    unchanged = manifest.get(rel) == digests[rel]
+                else:
+                    unchanged = os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src)
+
+                if unchanged and os.path.exists(dst) and not options["force"]:
+                    skipped += 1
+                    continue
+
+                jobs.append((mode, src, dst, rel, options["block_size"], options["search_depth"],
+                             options["max_code_length"], options["codec"], options["policy"]))
+
+        return jobs, skipped, digests
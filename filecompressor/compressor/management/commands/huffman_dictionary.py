@@ -0,0 +1,60 @@
+"""
+Trains a static Huffman dictionary from sample files and ships it under a new id.
+
+    python manage.py huffman_dictionary 1 csv ../sample/input/customers-100.csv exports/*.csv
+
+The dictionary is written to compressor/algorithm/dictionaries/ and registered as the codec
+"dict:<name>" the next time the app starts. Ids are stored in compressed files, so an id that
+has been shipped must never be reused — retrain under a new id instead.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from compressor.algorithm.dictionaries import (
+    DICTIONARY_DIR,
+    DICTIONARY_MAX_CODE_LENGTH,
+    save_dictionary,
+    train_dictionary,
+)
+from compressor.algorithm.huffman_full import check_code_length_limit
+
+
+def iter_samples(paths):
+    """Yield the content of every file, descending into directories."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for filename in sorted(files):
+                    with open(os.path.join(root, filename), "rb") as file:
+                        yield file.read()
+        else:
+            with open(path, "rb") as file:
+                yield file.read()
+
+
+class Command(BaseCommand):
+    help = "Train a static Huffman dictionary from sample files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("id", type=int, help="Permanent dictionary id (1-255, never reused)")
+        parser.add_argument("name", help="Dictionary name; the codec is called dict:<name>")
+        parser.add_argument("samples", nargs="+", help="Training files or directories")
+        parser.add_argument("--max-code-length", type=int, default=DICTIONARY_MAX_CODE_LENGTH,
+                            help="Longest code in the table, in bits")
+        parser.add_argument("--directory", default=DICTIONARY_DIR, help="Where to write the dictionary")
+
+    def handle(self, *args, **options):
+        missing = [path for path in options["samples"] if not os.path.exists(path)]
+        if missing:
+            raise CommandError(f"Not found: {', '.join(missing)}")
+
+        try:
+            check_code_length_limit(options["max_code_length"])
+            code_lengths = train_dictionary(iter_samples(options["samples"]), options["max_code_length"])
+            path = save_dictionary(options["id"], options["name"], code_lengths, options["directory"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path} (codec dict:{options['name']})"))
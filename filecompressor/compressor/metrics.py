@@ -0,0 +1,111 @@
+"""
+In-process codec metrics, exposed at /metrics in the Prometheus text format.
+
+Every compression or decompression that actually runs the codec (cache hits don't) is
+recorded with observe_operation: latency, throughput, input size and space saved, plus the
+per-stage times collected by compressor.algorithm.instrumentation. Values are kept per process;
+with several server processes, each one reports its own.
+"""
+
+import threading
+from bisect import bisect_left
+
+from . import result_cache
+from .algorithm import calculate_compression_ratio
+
+
+class Histogram:
+    """
+    A Prometheus histogram with labels: cumulative bucket counts, sum and count per label set.
+    buckets: upper bounds in increasing order (+Inf is added)
+    """
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = list(buckets)
+        self.label_names = label_names
+        self.series = {}  # label values → [bucket counts..., +Inf count], sum
+
+    def observe(self, value, *label_values):
+        with _lock:
+            counts, total = self.series.get(label_values, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect_left(self.buckets, value)] += 1  # Bounds are inclusive (le)
+            self.series[label_values] = (counts, total + value)
+
+    def render(self):
+        """Returns: Lines of the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self.series.items()}
+
+        for label_values, (counts, total) in sorted(series.items()):
+            labels = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ["+Inf"], counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+_lock = threading.Lock()
+
+SECONDS_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+OPERATION_SECONDS = Histogram("huffman_operation_seconds", "Wall-clock time of one codec operation.",
+                              SECONDS_BUCKETS, ("operation",))
+OPERATION_THROUGHPUT = Histogram("huffman_operation_throughput_mb_per_second",
+                                 "Uncompressed megabytes (MiB) processed per second.",
+                                 [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500], ("operation",))
+OPERATION_INPUT_BYTES = Histogram("huffman_operation_input_bytes", "Size of the operation's input.",
+                                  [1 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20,
+                                   64 << 20, 256 << 20, 1 << 30], ("operation",))
+OPERATION_RATIO = Histogram("huffman_operation_ratio_percent", "Space saved by compression, in percent.",
+                            [-10, 0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100], ("operation",))
+STAGE_SECONDS = Histogram("huffman_stage_seconds", "Time spent in one codec stage during an operation.",
+                          SECONDS_BUCKETS, ("operation", "stage"))
+
+HISTOGRAMS = [OPERATION_SECONDS, OPERATION_THROUGHPUT, OPERATION_INPUT_BYTES, OPERATION_RATIO, STAGE_SECONDS]
+
+
+def observe_operation(operation, seconds, original_size, compressed_size, stages=None):
+    """
+    Records one codec run.
+    original_size, compressed_size: uncompressed and compressed sizes (for either direction)
+    stages: StageStats collected during the run, if any
+    """
+    input_size = original_size if operation != "decompress" else compressed_size
+
+    OPERATION_SECONDS.observe(seconds, operation)
+    OPERATION_INPUT_BYTES.observe(input_size, operation)
+    if seconds > 0:
+        OPERATION_THROUGHPUT.observe(original_size / (1024 * 1024) / seconds, operation)
+    if original_size:
+        OPERATION_RATIO.observe(calculate_compression_ratio(original_size, compressed_size), operation)
+
+    if stages is not None:
+        for name, stage_seconds in stages.seconds.items():
+            STAGE_SECONDS.observe(stage_seconds, operation, name)
+
+
+def render_metrics():
+    """
+    Renders every histogram plus the result cache counters.
+    Returns: Prometheus text exposition (str)
+    """
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+
+    cache = result_cache.cache_stats()
+    lines += [
+        "# HELP huffman_result_cache_lookups_total Result cache lookups by outcome.",
+        "# TYPE huffman_result_cache_lookups_total counter",
+        f'huffman_result_cache_lookups_total{{result="hit"}} {cache["hits"]}',
+        f'huffman_result_cache_lookups_total{{result="miss"}} {cache["misses"]}',
+        "# HELP huffman_result_cache_bytes Size of the result cache on disk.",
+        "# TYPE huffman_result_cache_bytes gauge",
+        f"huffman_result_cache_bytes {cache['bytes']}",
+    ]
+    return "\n".join(lines) + "\n"
@@ -1,3 +1,46 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+class Job(models.Model):
+    """
+    A compression or decompression of a large upload, run in the background by compressor/jobs.py.
+    Progress is written back here after each block so the page can poll it.
+    """
+    COMPRESS = "compress"
+    DECOMPRESS = "decompress"
+    OPERATIONS = [(COMPRESS, "Compress"), (DECOMPRESS, "Decompress")]
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    operation = models.CharField(max_length=10, choices=OPERATIONS)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+
+    file_name = models.CharField(max_length=255)                # Uploaded file name
+    result_name = models.CharField(max_length=255, blank=True)  # Download file name
+    artifact = models.CharField(max_length=32, blank=True)      # Result id in the artifact store
+    codec = models.CharField(max_length=64, blank=True)         # Codec(s) of the compressed file
+    error = models.TextField(blank=True)
+
+    bytes_done = models.BigIntegerField(default=0)   # Input bytes processed so far
+    bytes_total = models.BigIntegerField(default=0)  # Input size
+    result_size = models.BigIntegerField(default=0)
+
+    owner_pid = models.IntegerField(null=True, blank=True)          # Process whose worker pool holds the job
+    heartbeat_at = models.DateTimeField(null=True, blank=True)      # Last sign of life from that process
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.operation} {self.file_name} ({self.status})"
@@ -0,0 +1,127 @@
+"""
+Content-addressed cache of compression and decompression results.
+
+Results are keyed by a BLAKE2b hash of the uploaded content, the operation, its
+parameters and the codec version, so re-uploading the same file is served from disk
+without running the codec again. Hits refresh an entry's mtime, and the least recently
+used entries are evicted once the cache grows past RESULT_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from .algorithm.huffman_full import CODEC_VERSION
+
+
+CACHE_KEY_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}  # Counted per process since start-up
+
+
+def cache_root():
+    """Return the cache directory, creating it on first use."""
+    root = Path(settings.RESULT_CACHE_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def cache_key(operation, data, *params):
+    """
+    Hash the input content together with everything else that determines the result.
+    data may be bytes, a memoryview or a memory map; it is hashed without copying.
+    Returns: Key (40 hex characters)
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{operation}\0{CODEC_VERSION}\0{chr(0).join(params)}\0".encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def lookup(key, use=None):
+    """
+    Find a cached result and mark it as recently used.
+    use: optional callable(path) applied to the entry, e.g. to publish it; if the entry is evicted
+    before use opens it (FileNotFoundError), the lookup is a miss. Hits are counted only once
+    use has succeeded.
+    Returns: Path of the cached result (or what use returned), or None on a miss.
+    """
+    path = cache_root() / key
+    try:
+        os.utime(path)  # Refresh the LRU position
+        result = use(path) if use is not None else path
+    except FileNotFoundError:
+        _count("misses")
+        return None
+
+    _count("hits")
+    return result
+
+
+def store(key, data):
+    """
+    Cache a result (written under a temporary name, then renamed) and evict old entries.
+    Returns: Path of the cached result.
+    """
+    root = cache_root()
+    path = root / key
+    partial = root / f"{key}.{os.getpid()}.{threading.get_ident()}.part"
+
+    with open(partial, "wb") as file:
+        file.write(data)
+    os.replace(partial, path)
+
+    evict(keep=key)
+    return path
+
+
+def evict(keep=None):
+    """Delete least recently used entries until the cache fits RESULT_CACHE_MAX_BYTES."""
+    entries = []
+    total = 0
+    for path in cache_root().iterdir():
+        if not CACHE_KEY_PATTERN.match(path.name):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= settings.RESULT_CACHE_MAX_BYTES:
+            break
+        if path.name == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _count(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def cache_stats():
+    """Return hit/miss counters of this process plus the cache's current size."""
+    entries = 0
+    size = 0
+    for path in cache_root().iterdir():
+        if CACHE_KEY_PATTERN.match(path.name):
+            entries += 1
+            size += path.stat().st_size
+
+    with _stats_lock:
+        stats = dict(_stats)
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+    stats["entries"] = entries
+    stats["bytes"] = size
+    return stats
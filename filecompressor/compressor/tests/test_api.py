@@ -0,0 +1,34 @@
+from django.test import AsyncClient, TestCase
+
+from ..algorithm import decompress_huffman
+from .utils import IsolatedStorageMixin, sample_bytes
+
+
+class ApiTests(IsolatedStorageMixin, TestCase):
+    async def post(self, url, data):
+        response = await AsyncClient().post(url, data, content_type="application/octet-stream")
+        body = b"".join([piece async for piece in response.streaming_content]) if response.streaming else None
+        return response, body
+
+    async def test_compress_and_decompress_stream(self):
+        data = sample_bytes("customers-100.csv") * 20
+        response, compressed = await self.post("/api/compress/?name=customers.csv&block_size=65536", data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="customers(csv).huff"')
+        self.assertEqual(decompress_huffman(compressed)[0], data)
+
+        response, decompressed = await self.post("/api/decompress/?name=customers(csv).huff", compressed)
+        self.assertEqual((response["X-Original-Extension"], decompressed), ("csv", data))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="customers.csv"')
+
+    async def test_download_name_is_encoded(self):
+        response, _ = await self.post('/api/compress/?name=a"b;ü.txt', b"hello")
+        self.assertEqual(response["Content-Disposition"], "attachment; filename*=utf-8''a%22b%3B%C3%BC%28txt%29.huff")
+
+    async def test_invalid_requests(self):
+        for url in ("/api/compress/?block_size=0", "/api/compress/?block_size=4194305", "/api/compress/?codec=bogus"):
+            with self.subTest(url=url):
+                response, _ = await self.post(url, b"hello")
+                self.assertEqual(response.status_code, 400)
+        response, _ = await self.post("/api/decompress/", b"junk")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from django.test import TestCase
+
+from ..algorithm import compress_archive, extract_all, extract_member, is_archive, list_archive
+from .utils import sample_bytes
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.files = [("sample.txt", sample_bytes("sample.txt")), ("customers-100.csv", sample_bytes("customers-100.csv")),
+                     ("empty.txt", b""), ("README", b"no extension " * 50)]
+        cls.archive = compress_archive(cls.files)
+
+    def test_list_and_extract_all(self):
+        self.assertTrue(is_archive(self.archive))
+        members = list_archive(self.archive)
+        self.assertEqual([member.original_size for member in members], [len(data) for _, data in self.files])
+        self.assertEqual(extract_all(self.archive), self.files)
+
+    def test_extract_member_by_index_and_name(self):
+        with tempfile.NamedTemporaryFile(suffix=".hufa") as file:
+            file.write(self.archive)
+            file.flush()
+            for source in (self.archive, file.name):
+                for index, (name, data) in enumerate(self.files):
+                    self.assertEqual(extract_member(source, index), (name, data))
+                    self.assertEqual(extract_member(source, name), (name, data))
+
+    def test_missing_member(self):
+        for member in (len(self.files), "missing.txt"):
+            with self.assertRaises(ValueError):
+                extract_member(self.archive, member)
+
+    def test_parallel_archive_is_identical(self):
+        self.assertEqual(compress_archive(self.files, workers=2), self.archive)
+
+    def test_path_sources_are_identical(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for index, (_, data) in enumerate(self.files):
+                paths.append(os.path.join(directory, f"upload-{index}.tmp"))  # Names come from the pairs, not the paths
+                with open(paths[-1], "wb") as file:
+                    file.write(data)
+            files = [(name, path) for (name, _), path in zip(self.files, paths)]
+            self.assertEqual(compress_archive(files), self.archive)
+            self.assertEqual(compress_archive(files, workers=2), self.archive)
+
+    def test_invalid_archives(self):
+        with self.assertRaises(ValueError):
+            compress_archive([("a.txt", b"a"), ("dir/a.txt", b"b")])
+        with self.assertRaises(ValueError):
+            list_archive(b"HUFA" + b"\0" * 20)
+        with self.assertRaises(ValueError):
+            list_archive(self.archive[:-1])
@@ -0,0 +1,76 @@
+import random
+
+from django.test import TestCase
+
+from ..algorithm import compress_huffman, decompress_huffman
+from ..algorithm.huffman_full import (
+    build_huffman_tree,
+    generate_huffman_code,
+    huffman_code_lengths,
+    limited_code_lengths,
+    two_queue_code_lengths,
+)
+from .utils import sample_bytes
+
+
+def code_cost(freq_table, code_lengths):
+    """Returns: Total encoded size in bits."""
+    return sum(freq_table[symbol] * code_lengths[symbol] for symbol in freq_table)
+
+
+def kraft_sum(code_lengths):
+    return sum(2.0 ** -length for length in code_lengths.values())
+
+
+def random_tables(count=50, seed=4):
+    """Returns: Frequency tables of varied size and skew, including ties and a Fibonacci-like worst case."""
+    rng = random.Random(seed)
+    tables = [{symbol: rng.randint(1, 1000) for symbol in range(rng.randint(2, 256))} for _ in range(count)]
+    tables += [{symbol: rng.choice([1, 2, 3]) for symbol in range(40)},
+               {symbol: int(1.6 ** symbol) + 1 for symbol in range(40)}]
+    return tables
+
+
+class CodeLengthTests(TestCase):
+    def test_two_queue_matches_heap_huffman_cost(self):
+        for freq_table in random_tables():
+            code_map = {}
+            generate_huffman_code(build_huffman_tree(freq_table), "", code_map)
+            heap_lengths = {symbol: len(code) for symbol, code in code_map.items()}
+            lengths = two_queue_code_lengths(freq_table)
+            self.assertEqual(code_cost(freq_table, lengths), code_cost(freq_table, heap_lengths))
+            self.assertEqual(kraft_sum(lengths), 1.0)
+
+    def test_two_queue_single_symbol(self):
+        self.assertEqual(two_queue_code_lengths({65: 10}), {65: 1})
+        self.assertEqual(two_queue_code_lengths({}), {})
+
+    def test_limited_code_lengths_respect_limit_and_kraft(self):
+        for freq_table in random_tables():
+            for max_length in (9, 11, 15):
+                if len(freq_table) > 1 << max_length:
+                    continue
+                lengths = limited_code_lengths(freq_table, max_length)
+                self.assertEqual(set(lengths), set(freq_table))
+                self.assertLessEqual(max(lengths.values()), max_length)
+                self.assertLessEqual(kraft_sum(lengths), 1.0)
+
+    def test_limited_code_lengths_are_optimal_when_the_limit_is_loose(self):
+        for freq_table in random_tables(count=10):
+            unlimited = two_queue_code_lengths(freq_table)
+            limited = limited_code_lengths(freq_table, max(unlimited.values()))
+            self.assertEqual(code_cost(freq_table, limited), code_cost(freq_table, unlimited))
+
+    def test_huffman_code_lengths_applies_limit_only_when_needed(self):
+        fibonacci = {symbol: int(1.6 ** symbol) + 1 for symbol in range(40)}
+        self.assertGreater(max(huffman_code_lengths(fibonacci).values()), 12)
+        self.assertEqual(max(huffman_code_lengths(fibonacci, 12).values()), 12)
+
+    def test_too_many_symbols_for_limit(self):
+        with self.assertRaises(ValueError):
+            limited_code_lengths({symbol: 1 for symbol in range(20)}, 4)
+
+    def test_max_code_length_round_trip(self):
+        text = sample_bytes("sample.txt")
+        compressed = compress_huffman(text, "txt", max_code_length=11)
+        self.assertEqual(decompress_huffman(compressed), (text, "txt"))
@@ -0,0 +1,160 @@
+import io
+import os
+import random
+import tempfile
+
+from django.test import TestCase
+
+from ..algorithm import (
+    compress_file,
+    compress_huffman,
+    compress_stream,
+    container_codecs,
+    decompress_file,
+    decompress_huffman,
+    decompress_range,
+    decompress_stream,
+    iter_compress,
+    iter_decompress,
+)
+from .utils import sample_bytes
+
+
+TEXT = sample_bytes("sample.txt") * 3
+BLOCK_SIZE = 1 << 16    # Several blocks per input
+
+
+def rewrite_index_sizes(compressed, raw_lens):
+    """Returns: compressed with the raw lengths in its trailing block index replaced (frames untouched)."""
+    data = bytearray(compressed)
+    count = int.from_bytes(data[-16:-12], "big")
+    index_offset = int.from_bytes(data[-12:-4], "big")
+    assert count == len(raw_lens)
+    for i, raw_len in enumerate(raw_lens):
+        entry = index_offset + 12 * i
+        data[entry + 8:entry + 12] = raw_len.to_bytes(4, "big")
+    return bytes(data)
+
+
+class StreamingTests(TestCase):
+    def test_in_memory_round_trip_is_deterministic(self):
+        compressed = compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE)
+        self.assertEqual(compressed[:4], b"HUF3")
+        self.assertEqual(compressed, compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE))
+        self.assertEqual(decompress_huffman(compressed), (TEXT, "txt"))
+
+    def test_stream(self):
+        compressed = io.BytesIO()
+        compress_stream(io.BytesIO(TEXT), compressed, "txt", block_size=BLOCK_SIZE)
+        self.assertEqual(compressed.getvalue(), compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE))
+
+        decompressed = io.BytesIO()
+        ext = decompress_stream(io.BytesIO(compressed.getvalue()), decompressed)
+        self.assertEqual((decompressed.getvalue(), ext), (TEXT, "txt"))
+
+    def test_iterators(self):
+        pieces = list(iter_compress(io.BytesIO(TEXT), "txt", block_size=BLOCK_SIZE))
+        ext, blocks = iter_decompress(io.BytesIO(b"".join(pieces)))
+        self.assertEqual((b"".join(blocks), ext), (TEXT, "txt"))
+
+    def test_empty_and_single_symbol_input(self):
+        self.assertEqual(compress_huffman(b"", "txt"), b"")
+        data = b"a" * 10_000
+        self.assertEqual(decompress_huffman(compress_huffman(data, "txt"))[0], data)
+
+    def test_corrupted_input_is_rejected(self):
+        compressed = compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE)
+        for broken in (b"junk", compressed[:len(compressed) // 2]):
+            with self.assertRaises(ValueError):
+                decompress_huffman(broken)
+
+
+class ParallelTests(TestCase):
+    def test_parallel_compression_is_identical(self):
+        serial = compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE)
+        self.assertEqual(compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE, workers=2), serial)
+
+        parallel = io.BytesIO()
+        compress_stream(io.BytesIO(TEXT), parallel, "txt", block_size=BLOCK_SIZE, workers=2)
+        self.assertEqual(parallel.getvalue(), serial)
+
+
+class ParallelDecodeTests(TestCase):
+    def test_parallel_decode_matches_input(self):
+        compressed = compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE)
+        self.assertEqual(decompress_huffman(compressed, workers=2), (TEXT, "txt"))
+
+    def test_index_that_disagrees_with_the_frames_is_rejected(self):
+        data = TEXT[:12288]
+        compressed = compress_huffman(data, "txt", block_size=8192)
+        tampered = rewrite_index_sizes(compressed, [4096, 8192])  # Same total, wrong block boundaries
+
+        self.assertEqual(decompress_huffman(tampered)[0], data)  # The serial path only follows the frames
+        with self.assertRaisesRegex(ValueError, "Block index does not match the frame"):
+            decompress_huffman(tampered, workers=2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tampered.huff")
+            with open(path, "wb") as file:
+                file.write(tampered)
+            with self.assertRaisesRegex(ValueError, "Block index does not match the frame"):
+                decompress_file(path, os.path.join(directory, "out.txt"), workers=2)
+
+
+class RangeTests(TestCase):
+    def test_ranges_from_bytes_and_path(self):
+        compressed = compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "range.huff")
+            with open(path, "wb") as file:
+                file.write(compressed)
+
+            for start, length in ((0, 100), (BLOCK_SIZE - 10, 20), (len(TEXT) - 5, 100), (len(TEXT), 1), (7, 0)):
+                with self.subTest(start=start, length=length):
+                    expected = TEXT[start:start + length]
+                    self.assertEqual(decompress_range(compressed, start, length), expected)
+                    self.assertEqual(decompress_range(path, start, length), expected)
+
+    def test_index_mismatch_and_negative_ranges_are_rejected(self):
+        compressed = compress_huffman(TEXT[:12288], "txt", block_size=8192)
+        with self.assertRaises(ValueError):
+            decompress_range(rewrite_index_sizes(compressed, [4096, 8192]), 0, 12288)
+        with self.assertRaises(ValueError):
+            decompress_range(compressed, -1, 10)
+
+
+class FileTests(TestCase):
+    def test_file_round_trip_with_progress(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "input.txt")
+            compressed = os.path.join(directory, "input(txt).huff")
+            restored = os.path.join(directory, "restored.txt")
+            with open(source, "wb") as file:
+                file.write(TEXT)
+
+            progress = []
+            compress_file(source, compressed, block_size=BLOCK_SIZE, progress=lambda done, total: progress.append(done))
+            self.assertEqual(progress[-1], len(TEXT))
+            with open(compressed, "rb") as file:
+                self.assertEqual(file.read(), compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE))
+
+            for workers in (1, 2):
+                with self.subTest(workers=workers):
+                    self.assertEqual(decompress_file(compressed, restored, workers=workers), "txt")
+                    with open(restored, "rb") as file:
+                        self.assertEqual(file.read(), TEXT)
+
+
+class StoredBlockTests(TestCase):
+    def test_incompressible_blocks_are_stored(self):
+        data = random.Random(1).randbytes(50_000)
+        compressed = compress_huffman(data, "bin")
+        self.assertEqual(container_codecs(compressed), ["stored"])
+        self.assertLess(len(compressed), len(data) + 100)
+        self.assertEqual(decompress_huffman(compressed)[0], data)
+
+    def test_mixed_input_stores_only_incompressible_blocks(self):
+        data = TEXT[:BLOCK_SIZE] + random.Random(2).randbytes(BLOCK_SIZE)
+        compressed = compress_huffman(data, "bin", block_size=BLOCK_SIZE)
+        self.assertEqual(container_codecs(compressed), ["huffman", "stored"])
+        self.assertEqual(decompress_huffman(compressed)[0], data)
@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from ..algorithm import POLICIES, choose_codec, compress_huffman, container_codecs, decompress_huffman, dictionaries
+from .utils import sample_bytes
+
+
+CSV = sample_bytes("customers-100.csv")[1000:1400]    # Small enough for a static dictionary to win
+
+
+class DictionaryTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.code_lengths = dictionaries.train_dictionary([sample_bytes("customers-100.csv")])
+
+    def test_trained_dictionary_round_trips(self):
+        path = dictionaries.save_dictionary(200, "customers", self.code_lengths, self.directory)
+        self.assertEqual(dictionaries.read_dictionary(Path(path).read_bytes()), (200, "customers", self.code_lengths))
+        self.assertEqual(len(self.code_lengths), 256)
+
+    def test_reused_or_unsafe_names_are_rejected(self):
+        dictionaries.save_dictionary(200, "customers", self.code_lengths, self.directory)
+        for dict_id, name in ((200, "other"), (201, "customers"), (202, "../escape"), (203, "")):
+            with self.subTest(dict_id=dict_id, name=name), self.assertRaises(ValueError):
+                dictionaries.save_dictionary(dict_id, name, self.code_lengths, self.directory)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_dictionary_codecs_respect_max_code_length(self):
+        self.assertEqual(choose_codec(CSV, "ratio"), "dict:csv")
+        for policy in POLICIES:
+            with self.subTest(policy=policy):
+                self.assertFalse(choose_codec(CSV, policy, max_code_length=9).startswith("dict:"))
+
+        # Requested by name, the block falls back to plain Huffman under the limit
+        compressed = compress_huffman(CSV, "csv", codec="dict:csv", max_code_length=9)
+        self.assertEqual(container_codecs(compressed), ["huffman"])
+        self.assertEqual(decompress_huffman(compressed), (CSV, "csv"))
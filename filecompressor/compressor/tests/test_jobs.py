@@ -0,0 +1,132 @@
+import os
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .. import jobs
+from ..algorithm import decompress_huffman
+from ..apps import serving_requests
+from ..models import Job
+from .utils import IsolatedStorageMixin, sample_bytes
+
+
+class FakePool:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, func, job_id):
+        self.submitted.append(job_id)
+
+
+@override_settings(JOB_THRESHOLD_BYTES=16 * 1024)
+class JobTests(IsolatedStorageMixin, TransactionTestCase):
+    def wait_for(self, job_id, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = self.client.get(f"/jobs/{job_id}/").json()
+            if status["status"] in (Job.DONE, Job.FAILED):
+                return status
+            time.sleep(0.05)
+        self.fail(f"Job {job_id} did not finish")
+
+    def make_job(self, status, owner_pid, heartbeat_at=None, with_input=True):
+        job = Job.objects.create(operation=Job.COMPRESS, file_name="a.txt", status=status, owner_pid=owner_pid,
+                                 heartbeat_at=heartbeat_at or timezone.now(), bytes_total=5)
+        if with_input:
+            jobs.input_path(job.pk).write_bytes(b"hello")
+        return job
+
+    def test_compress_and_decompress_jobs(self):
+        data = sample_bytes("sample.txt")  # Still above the threshold once compressed
+        response = self.upload("/compressor/", "big.txt", data)
+        status = self.wait_for(response.context["job"].pk)
+        self.assertEqual(status["status"], Job.DONE, status["error"])
+        self.assertEqual(status["percent"], 100.0)
+        compressed = self.download(status["download_url"])
+        self.assertEqual(decompress_huffman(compressed)[0], data)
+
+        response = self.upload("/decompressor/", "big(txt).huff", compressed)
+        status = self.wait_for(response.context["job"].pk)
+        download = self.client.get(status["download_url"])
+        self.assertEqual(download["Content-Disposition"], 'attachment; filename="big.txt"')
+        self.assertEqual(b"".join(download.streaming_content), data)
+
+    def test_failed_job_and_unknown_job(self):
+        response = self.upload("/decompressor/", "bad.huff", b"x" * (128 * 1024))
+        status = self.wait_for(response.context["job"].pk)
+        self.assertEqual(status["status"], Job.FAILED)
+        self.assertIn("missing signature", status["error"])
+        self.assertEqual(self.client.get("/jobs/00000000-0000-0000-0000-000000000000/").status_code, 404)
+
+    def test_job_runs_only_once(self):
+        job = self.make_job(Job.QUEUED, os.getpid())
+        jobs.run_job(job.pk)
+        jobs.run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result_name), (Job.DONE, "a(txt).huff"))
+
+        running = self.make_job(Job.RUNNING, os.getpid())
+        jobs.run_job(running.pk)  # Claimed by someone else: left alone, input kept
+        running.refresh_from_db()
+        self.assertEqual(running.status, Job.RUNNING)
+        self.assertTrue(jobs.input_path(running.pk).exists())
+
+    def test_resume_takes_over_only_orphaned_jobs(self):
+        live, dead = os.getpid() + 1, os.getpid() + 2
+
+        def kill(pid, signal):
+            if pid != live:
+                raise ProcessLookupError
+
+        live_running = self.make_job(Job.RUNNING, live)
+        live_queued = self.make_job(Job.QUEUED, live)
+        dead_running = self.make_job(Job.RUNNING, dead)
+        no_owner = self.make_job(Job.QUEUED, None)
+        stale = self.make_job(Job.RUNNING, live, heartbeat_at=timezone.now() - timedelta(hours=1))
+        lost = self.make_job(Job.QUEUED, dead, with_input=False)
+
+        pool = FakePool()
+        with mock.patch.object(os, "kill", kill):
+            jobs.resume_jobs(pool)
+        self.assertCountEqual(pool.submitted, [dead_running.pk, no_owner.pk, stale.pk])
+
+        statuses = {job.pk: (job.status, job.owner_pid) for job in Job.objects.all()}
+        self.assertEqual(statuses[live_running.pk], (Job.RUNNING, live))
+        self.assertEqual(statuses[live_queued.pk], (Job.QUEUED, live))
+        self.assertEqual(statuses[dead_running.pk], (Job.QUEUED, os.getpid()))
+        self.assertEqual(statuses[lost.pk][0], Job.FAILED)
+
+    def test_start_workers_resumes_orphaned_jobs(self):
+        orphan = self.make_job(Job.RUNNING, None)
+        with mock.patch.object(jobs, "_pool", None):
+            jobs.start_workers()
+            self.addCleanup(jobs._pool.shutdown)
+            self.assertEqual(self.wait_for(orphan.pk)["status"], Job.DONE)
+
+
+class StartupTests(TestCase):
+    def test_only_server_processes_start_the_pool(self):
+        cases = [
+            (["manage.py", "migrate"], {}, False),
+            (["manage.py", "test", "compressor"], {}, False),
+            (["manage.py", "runserver"], {}, False),                  # The autoreloader's parent
+            (["manage.py", "runserver"], {"RUN_MAIN": "true"}, True),
+            (["manage.py", "runserver", "--noreload"], {}, True),
+            (["/venv/bin/gunicorn", "filecompressor.wsgi"], {}, True),
+        ]
+        for argv, environ, expected in cases:
+            with self.subTest(argv=argv, environ=environ), mock.patch("sys.argv", argv), \
+                    mock.patch.dict(os.environ, environ):
+                if "RUN_MAIN" not in environ:
+                    os.environ.pop("RUN_MAIN", None)
+                self.assertIs(serving_requests(), expected)
+
+    def test_unmigrated_database_does_not_keep_a_pool(self):
+        with mock.patch.object(jobs, "_pool", None), \
+                mock.patch.object(jobs, "resume_jobs", side_effect=DatabaseError("no such table")):
+            jobs.start_workers()
+            self.assertIsNone(jobs._pool)
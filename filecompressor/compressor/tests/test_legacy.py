@@ -0,0 +1,74 @@
+import hashlib
+import os
+from collections import Counter
+
+from django.test import TestCase
+
+from ..algorithm import decompress_huffman
+from ..algorithm.huffman_full import (
+    canonical_huffman_code,
+    encode_data_to_bitarray,
+    huffman_code_lengths,
+    load_code_lengths,
+    write_code_lengths,
+)
+from .utils import SAMPLE_DIR, sample_bytes
+
+
+# Extension, decoded size and SHA-256 of every shipped HUF1 file in sample/output
+HUF1_DIGESTS = {
+    "DLD_CEP_REPORT(docx).huff": ("docx", 477204, "e2347474bbb61709695062ecfff9f50c58f8be180bf2aabd9e23c55fb3c08a87"),
+    "DoublyLinkedList(py).huff": ("py", 3696, "f56358e2cb693df1cbf50305c14dbd58ca0543516533b22806fa31ca37198849"),
+    "FINAL_CEP(circ).huff": ("circ", 32287, "7fa91a4e1c9a45770b0a338f40b251c6c16918f02b077715ce1ba58a0801a736"),
+    "Lab1_Q1(exe).huff": ("exe", 60646, "495df0d094864cfe3836cca0bc7e45a118e019b0922a6e6b053a055c27bfdb69"),
+    "RLC_Energy_Storage_Report(docx).huff": ("docx", 1529418,
+                                             "fbc37160194668b0fe205d7d48691268f3ea083e6311db3a6ed528f359d32153"),
+    "checker_pattern(bmp).huff": ("bmp", 12342, "63d658f3182534891fa0ea4d6adb6fc4dcfe233d7b4c94a24630c6fcc57f67aa"),
+    "complication(py).huff": ("py", 3111, "ee6977653fc5fb98207b6029b72cb1a8bce67feb66bd0c668c6f5d4f411bfdb4"),
+    "customers-100(csv).huff": ("csv", 17261, "2c36c054711dad021f45cc7e0990bd38864a51d753c8055b63e78014a6bee515"),
+    "sample(txt).huff": ("txt", 109585, "a83da21b5bfe005e91f139bd3ece27770a67bddb8aaccaddeafbcf7f7067fb4c"),
+    "test_repetitive(txt).huff": ("txt", 10485760, "b5eec3f68ef64d15e82dad91ff908582c5f081e61a62e22427af9bec2cd35f8d"),
+    "triangle(bmp).huff": ("bmp", 120054, "12702ef65cead24a4b4b4458ac988bf294e2455e3d7d29f11188e88255b2c2b0"),
+    "workbook(pdf).huff": ("pdf", 1077540, "50fbc3238e410e5485454abd2d0feb6dd90c11664337af907b9b1534aaa9df84"),
+}
+
+# Originals in sample/input that are unchanged since their HUF1 file was written
+HUF1_ORIGINALS = ["DLD_CEP_REPORT.docx", "Lab1_Q1.exe", "RLC_Energy_Storage_Report.docx", "checker_pattern.bmp",
+                  "triangle.bmp", "workbook.pdf"]
+
+
+class Huf1SampleTests(TestCase):
+    def test_samples_match_pinned_digests(self):
+        for name, (ext, size, digest) in HUF1_DIGESTS.items():
+            with self.subTest(name=name):
+                compressed = (SAMPLE_DIR / "output" / name).read_bytes()
+                self.assertEqual(compressed[:4], b"HUF1")
+                data, decoded_ext = decompress_huffman(compressed)
+                self.assertEqual((decoded_ext, len(data), hashlib.sha256(data).hexdigest()), (ext, size, digest))
+
+    def test_samples_match_originals_byte_for_byte(self):
+        for original in HUF1_ORIGINALS:
+            with self.subTest(original=original):
+                name, ext = os.path.splitext(original)
+                compressed = (SAMPLE_DIR / "output" / f"{name}({ext[1:]}).huff").read_bytes()
+                self.assertEqual(decompress_huffman(compressed)[0], sample_bytes(original))
+
+
+def huf2_file(data, ext="txt"):
+    """HUF2 bytes for data: canonical code length table and one payload, as HUF2 writers produced them."""
+    code_lengths = huffman_code_lengths(Counter(data))
+    header = b"HUF2" + bytes([len(ext)]) + ext.encode() + write_code_lengths(code_lengths)
+    return header + encode_data_to_bitarray(data, canonical_huffman_code(code_lengths))
+
+
+class Huf2Tests(TestCase):
+    def test_round_trip(self):
+        data = sample_bytes("customers-100.csv")
+        self.assertEqual(decompress_huffman(huf2_file(data, "csv")), (data, "csv"))
+
+    def test_missing_payload_is_rejected(self):
+        header = huf2_file(b"abc")[:-2]  # Table only: no padding byte, no payload
+        with self.assertRaises(ValueError):
+            load_code_lengths(header, from_bytes=True)
+        with self.assertRaises(ValueError):
+            decompress_huffman(header)
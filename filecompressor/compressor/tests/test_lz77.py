@@ -0,0 +1,41 @@
+import tracemalloc
+
+from django.test import TestCase
+
+from ..algorithm import compress_huffman, container_codecs, decompress_huffman
+from ..algorithm.lz77 import MAX_MATCH, expand_tokens, find_matches
+from .utils import sample_bytes
+
+
+class Lz77Tests(TestCase):
+    def test_round_trip(self):
+        text = sample_bytes("sample.txt")
+        plain = compress_huffman(text, "txt")
+        for options in ({"codec": "lz77"}, {"search_depth": 4}):
+            with self.subTest(**options):
+                compressed = compress_huffman(text, "txt", **options)
+                self.assertEqual(container_codecs(compressed), ["lz77"])
+                self.assertLess(len(compressed), len(plain))
+                self.assertEqual(decompress_huffman(compressed)[0], text)
+
+    def test_tokens_expand_to_input(self):
+        for data in (b"abcabcabcabcabcx", b"a" * 1000, bytes(range(256)) * 3):
+            with self.subTest(data=data[:16]):
+                self.assertEqual(expand_tokens(find_matches(data, 16), len(data)), data)
+
+    def test_corrupted_tokens_stop_at_the_declared_size(self):
+        tokens = [ord("a")] + [(MAX_MATCH, 1)] * 100_000  # Would expand to about 25 MB
+        tracemalloc.start()
+        try:
+            with self.assertRaises(ValueError):
+                expand_tokens(tokens, 1000)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1 << 20)
+        with self.assertRaises(ValueError):
+            expand_tokens([ord("a")] * 10, 5)
+        with self.assertRaises(ValueError):
+            expand_tokens([ord("a")] * 4, 5)  # Short blocks are still rejected
+        with self.assertRaises(ValueError):
+            expand_tokens([(3, 1)], 3)        # Reference before the start of the block
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from ..algorithm import POLICIES, choose_codec, codec_names, compress_huffman, container_codecs, decompress_huffman
+from ..algorithm import registry
+from .utils import sample_bytes
+
+
+TEXT = sample_bytes("sample.txt") * 3
+BLOCK_SIZE = 1 << 16
+
+
+class RegistryTests(TestCase):
+    def test_every_codec_round_trips(self):
+        for codec in codec_names():
+            with self.subTest(codec=codec):
+                compressed = compress_huffman(TEXT, "txt", block_size=BLOCK_SIZE, codec=codec)
+                self.assertEqual(decompress_huffman(compressed), (TEXT, "txt"))
+                self.assertEqual(container_codecs(compressed), [codec])
+
+    def test_auto_codec(self):
+        for policy in POLICIES:
+            with self.subTest(policy=policy):
+                compressed = compress_huffman(TEXT, "txt", codec="auto", policy=policy)
+                self.assertEqual(decompress_huffman(compressed)[0], TEXT)
+
+    def test_codec_names_hide_decode_only_codecs(self):
+        names = codec_names()
+        self.assertNotIn("stored", names)
+        self.assertNotIn("dictionary", names)
+        self.assertIn("huffman", names)
+        with self.assertRaises(ValueError):
+            compress_huffman(b"abc", "txt", codec="stored")
+
+    def test_slow_codecs_are_skipped_under_faster_policies(self):
+        lz77 = registry._codecs["lz77"]
+        trial = mock.Mock(side_effect=lz77.compress)
+        with mock.patch.dict(registry._codecs, {"lz77": lz77._replace(compress=trial)}):
+            choose_codec(sample_bytes("sample.txt"), "speed")
+            choose_codec(sample_bytes("sample.txt"), "balanced")
+            trial.assert_not_called()
+            choose_codec(sample_bytes("sample.txt"), "ratio")
+            trial.assert_called()
+
+    def test_unknown_codec_or_policy(self):
+        with self.assertRaises(ValueError):
+            compress_huffman(b"abc", "txt", codec="bogus")
+        with self.assertRaises(ValueError):
+            compress_huffman(b"abc", "txt", codec="auto", policy="bogus")
+
+    def test_empty_frame_is_rejected(self):
+        compressed = bytearray(compress_huffman(b"abc" * 1000, "txt", codec="zlib"))
+        compressed[13:17] = bytes(4)    # raw_len of the first frame, after the 12-byte header
+        zlib_codec = registry._codecs["zlib"]
+        decoder = mock.Mock(side_effect=zlib_codec.decompress)
+        with mock.patch.dict(registry._block_types, {zlib_codec.block_type: zlib_codec._replace(decompress=decoder)}):
+            with self.assertRaises(ValueError):
+                decompress_huffman(bytes(compressed))
+        decoder.assert_not_called()     # zlib reads a zero output limit as unlimited
@@ -0,0 +1,153 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.test import TestCase, override_settings
+
+from .. import result_cache, views
+from ..algorithm import decompress_huffman, extract_all
+from .utils import IsolatedStorageMixin, message_texts, sample_bytes
+
+
+class ViewTests(IsolatedStorageMixin, TestCase):
+    def test_compress_and_decompress_round_trip(self):
+        data = sample_bytes("customers-100.csv")
+        response = self.upload("/compressor/", "customers-100.csv", data)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.context["ratio"], 0)
+        self.assertNotIn("compressed_data", self.client.session)  # Only the artifact id is kept
+
+        download = self.client.get("/download_compressed/")
+        self.assertEqual(download["Content-Disposition"], 'attachment; filename="customers-100(csv).huff"')
+        compressed = b"".join(download.streaming_content)
+        self.assertEqual(decompress_huffman(compressed)[0], data)
+
+        response = self.upload("/decompressor/", "customers-100(csv).huff", compressed)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("File decompressed successfully! ✅", message_texts(response))
+        download = self.client.get("/download_decompressed/")
+        self.assertEqual(download["Content-Disposition"], 'attachment; filename="customers-100.csv"')
+        self.assertEqual(b"".join(download.streaming_content), data)
+
+    def test_invalid_uploads_and_missing_artifacts(self):
+        response = self.upload("/decompressor/", "notes.txt", b"plain text")
+        self.assertIn("Only .huff or .hufa compressed files allowed ❌", message_texts(response))
+        response = self.upload("/decompressor/", "broken.huff", b"garbage")
+        self.assertTrue(message_texts(response)[0].startswith("Decompression failed"))
+
+        response = self.client.get("/download_compressed/", follow=True)
+        self.assertIn("No compressed file found.", message_texts(response))
+        session = self.client.session
+        session["compressed_artifact"] = "../../etc/passwd"
+        session.save()
+        response = self.client.get("/download_compressed/", follow=True)
+        self.assertIn("No compressed file found.", message_texts(response))
+
+    def test_multi_file_upload_builds_archive(self):
+        files = {"sample.txt": sample_bytes("sample.txt"), "customers-100.csv": sample_bytes("customers-100.csv")}
+        response = self.client.post("/compressor/", {"file": [SimpleUploadedFile(name, data)
+                                                              for name, data in files.items()]}, follow=True)
+        self.assertEqual(response.status_code, 200)
+        download = self.client.get("/download_compressed/")
+        self.assertEqual(download["Content-Disposition"], 'attachment; filename="archive.hufa"')
+        archive = b"".join(download.streaming_content)
+        self.assertEqual(dict(extract_all(archive)), files)
+
+        response = self.upload("/decompressor/", "archive.hufa", archive)
+        members = response.context["members"]
+        self.assertEqual([member["name"] for member in members], list(files))
+        for member in members:
+            download = self.client.get(f"/download_member/{member['index']}/")
+            self.assertEqual(b"".join(download.streaming_content), files[member["name"]])
+
+        response = self.client.get(f"/download_member/{len(files)}/", follow=True)
+        self.assertTrue(message_texts(response)[0].startswith("Decompression failed"))
+
+    def test_metrics(self):
+        self.upload("/compressor/", "sample.txt", sample_bytes("sample.txt"))
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('huffman_operation_seconds_count{operation="compress"}', body)
+        self.assertIn("huffman_result_cache_lookups_total", body)
+
+
+class SpooledUploadTests(IsolatedStorageMixin, TestCase):
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)  # Every upload goes to a temporary file and is memory-mapped
+    def test_disk_spooled_uploads(self):
+        data = sample_bytes("sample.txt")
+        self.upload("/compressor/", "sample.txt", data)
+        compressed = self.download("/download_compressed/")
+        self.upload("/decompressor/", "sample(txt).huff", compressed)
+        self.assertEqual(self.download("/download_decompressed/"), data)
+
+        with mock.patch.object(TemporaryUploadedFile, "read", side_effect=AssertionError("upload read into memory")):
+            response = self.upload("/compressor/", "other.txt", data + b"!")
+        self.assertIsNotNone(response.context["ratio"], message_texts(response))
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0, ARCHIVE_WORKERS=2, ARCHIVE_PARALLEL_BYTES=0)
+    def test_disk_spooled_archive_members_are_sent_as_paths(self):
+        files = {"sample.txt": sample_bytes("sample.txt"), "customers-100.csv": sample_bytes("customers-100.csv")}
+        with mock.patch.object(TemporaryUploadedFile, "read", side_effect=AssertionError("upload read into memory")):
+            response = self.client.post("/compressor/", {"file": [SimpleUploadedFile(name, data)
+                                                                  for name, data in files.items()]}, follow=True)
+        self.assertIsNotNone(response.context["ratio"], message_texts(response))
+        self.assertEqual(dict(extract_all(self.download("/download_compressed/"))), files)
+
+
+class ResultCacheTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        stats = mock.patch.dict(result_cache._stats, {"hits": 0, "misses": 0})
+        stats.start()
+        self.addCleanup(stats.stop)
+
+    def lookups(self):
+        stats = self.client.get("/cache/stats/").json()
+        return stats["hits"], stats["misses"]
+
+    def test_repeated_uploads_are_served_from_cache(self):
+        data = sample_bytes("sample.txt")
+        self.upload("/compressor/", "sample.txt", data)
+        first = self.download("/download_compressed/")
+
+        response = self.upload("/compressor/", "sample.txt", data)
+        self.assertIn("Served from cache — this file was compressed before.", message_texts(response))
+        self.assertEqual(self.download("/download_compressed/"), first)
+
+        self.upload("/decompressor/", "sample(txt).huff", first)
+        response = self.upload("/decompressor/", "sample(txt).huff", first)
+        self.assertIn("Served from cache — this file was decompressed before.", message_texts(response))
+        self.assertEqual(self.download("/download_decompressed/"), data)
+        self.assertEqual(self.lookups(), (2, 2))
+
+    def test_entry_evicted_before_it_is_published(self):
+        data = sample_bytes("sample.txt")
+        self.upload("/compressor/", "sample.txt", data)
+        publish = views.save_artifact_from_file
+
+        def evicted_first(path):
+            path.unlink()  # Another request's eviction wins the race
+            return publish(path)
+
+        with mock.patch.object(views, "save_artifact_from_file", evicted_first):
+            response = self.upload("/compressor/", "sample.txt", data)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Served from cache — this file was compressed before.", message_texts(response))
+        self.assertEqual(decompress_huffman(self.download("/download_compressed/"))[0], data)
+        self.assertEqual(self.lookups(), (0, 2))
+
+    def test_entry_evicted_right_after_store(self):
+        data = sample_bytes("customers-100.csv")
+        store = result_cache.store
+
+        def store_then_evict(key, result):
+            path = store(key, result)
+            path.unlink()
+            return path
+
+        with mock.patch.object(result_cache, "store", store_then_evict):
+            self.upload("/compressor/", "customers-100.csv", data)
+            compressed = self.download("/download_compressed/")
+            self.upload("/decompressor/", "customers-100(csv).huff", compressed)
+        self.assertEqual(decompress_huffman(compressed)[0], data)
+        self.assertEqual(self.download("/download_decompressed/"), data)
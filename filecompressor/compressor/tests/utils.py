@@ -0,0 +1,37 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent.parent.parent / "sample"
+
+
+def sample_bytes(name):
+    """Returns: Content of a file in sample/input."""
+    return (SAMPLE_DIR / "input" / name).read_bytes()
+
+
+def message_texts(response):
+    """Returns: The texts of the messages shown on a rendered page."""
+    return [str(message) for message in response.context["messages"]]
+
+
+class IsolatedStorageMixin:
+    """Points the artifact store, result cache and job directory at a fresh temporary directory per test."""
+    def setUp(self):
+        super().setUp()
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        storage = override_settings(ARTIFACT_ROOT=root / "artifacts", RESULT_CACHE_ROOT=root / "cache",
+                                    JOB_ROOT=root / "jobs")
+        storage.enable()
+        self.addCleanup(storage.disable)
+
+    def upload(self, url, name, data, **extra):
+        return self.client.post(url, {"file": SimpleUploadedFile(name, data)}, follow=True, **extra)
+
+    def download(self, url):
+        return b"".join(self.client.get(url).streaming_content)
@@ -1,6 +1,6 @@
 
 from django.urls import path
-from . import views
+from . import api, views
 
 
 urlpatterns = [
@@ -10,4 +10,16 @@ urlpatterns = [
 
     path('download_compressed/', views.download_compressed, name='download_compressed'),
     path('download_decompressed/', views.download_decompressed, name='download_decompressed'),
+    path('download_member/<int:index>/', views.download_member, name='download_member'),
+
+    path('cache/stats/', views.cache_stats, name='cache_stats'),
+    path('metrics', views.metrics_view, name='metrics'),
+
+    # Background jobs for large files
+    path('jobs/<uuid:job_id>/', views.job_status, name='job_status'),
+    path('jobs/<uuid:job_id>/download/', views.job_download, name='job_download'),
+
+    # Async streaming endpoints
+    path('api/compress/', api.api_compress, name='api_compress'),
+    path('api/decompress/', api.api_decompress, name='api_decompress'),
 ]
\ No newline at end of file
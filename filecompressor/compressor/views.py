@@ -2,23 +2,99 @@
 from django.shortcuts import render
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 
+import io
 import os
 import time
+from contextlib import contextmanager
 
+from . import metrics, result_cache
+from .jobs import job_eta, submit_job
+from .models import Job
+from .artifacts import artifact_path, save_artifact, save_artifact_from_file
+from .algorithm.huffman_full import read_signature
 from .algorithm import (
     compress_huffman,
     decompress_huffman,
+    decompress_range,
+    map_file,
+    container_codecs,
     calculate_compression_ratio,
+    collect_stages,
+    compress_archive,
+    extract_member,
+    list_archive,
+    member_filename,
 )
 
+PREVIEW_BYTES = 4 * 1024  # Size of the text preview shown after decompression
+
 # Home Page
 def home(request):
     """Render the home page of the compressor web application."""
     return render(request, "compressor/home.html")
 
 
+def text_preview(data):
+    """Return data as text for the preview, or None if it looks binary."""
+    if not data or b"\x00" in data:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+@contextmanager
+def mapped_upload(uploaded_file):
+    """
+    Yield the upload's content as a read-only memory map of the spooled temporary file,
+    so large uploads cost page cache instead of worker heap.
+    Uploads kept in memory (other upload handlers) are yielded as bytes.
+    """
+    if not hasattr(uploaded_file, "temporary_file_path"):
+        yield uploaded_file.read()
+        return
+
+    view = map_file(uploaded_file.temporary_file_path())
+    try:
+        yield view
+    finally:
+        view.release()
+
+
+def upload_source(uploaded_file):
+    """
+    Return the path of the upload's spooled temporary file, which compress_archive memory-maps
+    where the member is compressed (in a worker process, with ARCHIVE_WORKERS > 1).
+    Uploads kept in memory (other upload handlers) are returned as bytes.
+    """
+    if hasattr(uploaded_file, "temporary_file_path"):
+        return uploaded_file.temporary_file_path()
+    return uploaded_file.read()
+
+
+def publish_cached(key):
+    """
+    Publishes a cached result as a new artifact (a hard link, so later cache eviction cannot touch it).
+    Returns: Artifact id, or None on a miss, including an entry evicted since the lookup.
+    """
+    return result_cache.lookup(key, use=save_artifact_from_file)
+
+
+def publish_result(key, data):
+    """
+    Caches a freshly computed result and publishes it as a new artifact.
+    Returns: Artifact id (str)
+    """
+    cached_path = result_cache.store(key, data)
+    try:
+        return save_artifact_from_file(cached_path)
+    except FileNotFoundError:
+        return save_artifact(data)  # Evicted by a concurrent store before it could be linked
+
+
 def bytes_to_mb(bytes_size):
     """Convert bytes to KB or MB for display in the UI."""
     kb_size = bytes_size / 1024
@@ -27,41 +103,129 @@ def bytes_to_mb(bytes_size):
     return f"{round(bytes_size / (1024*1024), 2)} MB"  # MiB
 
 
+def archive_codecs(data, members):
+    """Return the codecs used by an archive's members, in order of first use."""
+    view = memoryview(data)
+    names = []
+    for member in members:
+        if member.compressed_size:
+            for name in container_codecs(view[member.offset:member.offset + member.compressed_size]):
+                if name not in names:
+                    names.append(name)
+    return names
+
+
+def compress_uploads(request, uploaded_files):
+    """
+    Compresses a multi-file upload into one archive (members memory-mapped like single uploads,
+    compressed in parallel with ARCHIVE_WORKERS > 1 once the upload reaches ARCHIVE_PARALLEL_BYTES)
+    and publishes it for a single download.
+    Returns: Rendered compressor page.
+    """
+    original_size = sum(uploaded_file.size for uploaded_file in uploaded_files)
+    if original_size >= settings.JOB_THRESHOLD_BYTES:
+        messages.error(request, f"Multi-file uploads must stay below {bytes_to_mb(settings.JOB_THRESHOLD_BYTES)}; "
+                                "upload large files one at a time")
+        return redirect('compressor')
+
+    try:
+        start = time.perf_counter()
+        files = [(uploaded_file.name, upload_source(uploaded_file)) for uploaded_file in uploaded_files]
+        workers = settings.ARCHIVE_WORKERS if original_size >= settings.ARCHIVE_PARALLEL_BYTES else 1
+        with collect_stages() as stages:
+            archive = compress_archive(files, workers=workers, codec=settings.COMPRESSION_CODEC,
+                                       policy=settings.CODEC_POLICY)
+        end = time.perf_counter()
+        metrics.observe_operation("archive", end - start, original_size, len(archive), stages)
+        codec = ", ".join(archive_codecs(archive, list_archive(archive)))
+
+    except Exception as e:
+        messages.error(request, f"Compression failed: {e}")
+        return redirect('compressor')
+
+    ratio = calculate_compression_ratio(original_size, len(archive))
+    request.session['filename'] = "archive.hufa"
+    request.session['compressed_artifact'] = save_artifact(archive)
+
+    if ratio > 0:
+        messages.success(request, f"{len(files)} files compressed into one archive! Saved {ratio}% ⚡")
+    else:
+        messages.warning(request, f"Compression unsuccessful. Compression overhead occurred. Ratio: {ratio}%❗")
+
+    context = {
+        "ratio": ratio,
+        "original_size": bytes_to_mb(original_size),
+        "compressed_size": bytes_to_mb(len(archive)),
+        "time_taken": end - start,
+        "name": f"{len(files)} files: " + ", ".join(name for name, _ in files),
+        "codec": codec,
+    }
+    return render(request, 'compressor/compressor.html', context)
+
+
 # Compressor View
 def compressor(request):
     """
     Handles file compression:
-    - Reads uploaded file
-    - Compresses using Huffman coding
-    - Calculates compression ratio
-    - Stores compressed data in session for download
+    - Memory-maps the uploaded file from its temporary file on disk
+    - Serves repeated uploads from the result cache, otherwise compresses with COMPRESSION_CODEC
+      ("auto" picks the codec per upload under CODEC_POLICY)
+    - Calculates compression ratio and reports the codec used
+    - Stores compressed data in the artifact store for download
     - Prepares data for template display
+    Uploads of JOB_THRESHOLD_BYTES or more are handed to a background job instead,
+    and multi-file uploads are compressed into one archive (see compress_uploads).
     """
-    original_text = None
-    compressed_data = None
+    original_size = None
+    compressed_size = None
     ratio = None
     start = None
     end = None
     file_name = None
+    codec = None
 
     if request.method == "POST":
-        uploaded_file = request.FILES.get("file")
-        if not uploaded_file:
+        uploaded_files = request.FILES.getlist("file")
+        if not uploaded_files:
             messages.error(request, "No file selected")
             return redirect('compressor')
 
+        if len(uploaded_files) > 1:
+            return compress_uploads(request, uploaded_files)
+        uploaded_file = uploaded_files[0]
+
         # Check file type for warnings
         ext = os.path.splitext(uploaded_file.name)[1][1:]
         if ext.lower() in ['jpg', 'jpeg', 'png', 'pdf', 'mp3', 'mp4', 'docx', 'pptx', 'xlsx']:
             messages.warning(request, f"Note: Accuracy may be low or in negative for already compressed files like {ext}.\nPrefer compressing uncompressed files")
 
-        # Read file content and compress
+        # Large files are compressed in the background; the page polls the job's progress
+        if uploaded_file.size >= settings.JOB_THRESHOLD_BYTES:
+            job = submit_job(Job.COMPRESS, uploaded_file)
+            return render(request, 'compressor/compressor.html', {"job": job})
+
+        # Map file content and compress (unless the same content was compressed before)
         try:
-            original_text = uploaded_file.read()
-            start = time.time()
-            compressed_data = compress_huffman(original_text, ext)
-            end = time.time()
-            ratio = calculate_compression_ratio(len(original_text), len(compressed_data))
+            with mapped_upload(uploaded_file) as original_data:
+                original_size = len(original_data)
+                start = time.perf_counter()
+                key = result_cache.cache_key("compress", original_data, ext, settings.COMPRESSION_CODEC, settings.CODEC_POLICY)
+                artifact_id = publish_cached(key)
+                if artifact_id is None:
+                    run_start = time.perf_counter()
+                    with collect_stages() as stages:
+                        compressed = compress_huffman(original_data, ext, codec=settings.COMPRESSION_CODEC,
+                                                      policy=settings.CODEC_POLICY)
+                    metrics.observe_operation("compress", time.perf_counter() - run_start, original_size,
+                                              len(compressed), stages)
+                    artifact_id = publish_result(key, compressed)
+                else:
+                    messages.info(request, "Served from cache — this file was compressed before.")
+                end = time.perf_counter()
+            compressed_path = artifact_path(artifact_id)
+            compressed_size = compressed_path.stat().st_size
+            ratio = calculate_compression_ratio(original_size, compressed_size)
+            codec = ", ".join(container_codecs(compressed_path))
 
         except Exception as e:
             messages.error(request, f"Compression failed: {e}")
@@ -73,8 +237,8 @@ def compressor(request):
         request.session['filename'] = huff_filename
         file_name = uploaded_file.name
 
-        # Store compressed data in session
-        request.session['compressed_data'] = compressed_data.hex()
+        # Keep only the published artifact's id in the session
+        request.session['compressed_artifact'] = artifact_id
 
         # Display result messages
         if ratio > 0:
@@ -84,10 +248,11 @@ def compressor(request):
 
     context = {
         "ratio": ratio, 
-        "original_size": bytes_to_mb(len(original_text)) if original_text else 0, 
-        "compressed_size": bytes_to_mb(len(compressed_data)) if compressed_data else 0,
+        "original_size": bytes_to_mb(original_size) if original_size else 0, 
+        "compressed_size": bytes_to_mb(compressed_size) if compressed_size else 0,
         "time_taken": (end - start) if start and end else None,
         "name": file_name if file_name else None,
+        "codec": codec,
     }
 
     return render(request, 'compressor/compressor.html', context)
@@ -97,40 +262,73 @@ def compressor(request):
 def download_compressed(request):
     """
     Sends the compressed Huffman file to the user for download.
-    Retrieves the hex-encoded compressed data and filename from session.
+    Streams the artifact referenced by the session straight from disk.
     """
 
-    # Retrieve compressed data and filename from session
-    compressed_data_hex = request.session.get('compressed_data')
+    # Retrieve compressed artifact and filename from session
+    path = artifact_path(request.session.get('compressed_artifact'))
     filename = request.session.get('filename')
 
-    # If no compressed file exists, show error and redirect
-    if not compressed_data_hex:
+    # If no compressed file exists (or it has expired), show error and redirect
+    if path is None:
         messages.error(request, "No compressed file found.")
         return redirect('compressor')
 
-    # Convert hex data back to bytes
-    compressed_data = bytes.fromhex(compressed_data_hex)
-    name, _ = os.path.splitext(filename)
-
-    # Prepare HTTP response for file download
-    response = HttpResponse(
-        compressed_data,
-        content_type="application/octet-stream"
+    # Prepare streaming HTTP response for file download (.huff, or .hufa for archives)
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=filename,
+        content_type="application/octet-stream",
     )
-    response['Content-Disposition'] = f'attachment; filename="{name}.huff"'
-    return response
+
+
+def open_archive_upload(request, uploaded_file):
+    """
+    Publishes an uploaded archive and lists its members. Nothing is decoded here:
+    each member is extracted on its own when it is downloaded (see download_member).
+    Returns: Rendered decompressor page.
+    """
+    try:
+        with mapped_upload(uploaded_file) as data:
+            start = time.perf_counter()
+            members = list_archive(data)
+            codec = ", ".join(archive_codecs(data, members))
+            end = time.perf_counter()
+            request.session['archive_artifact'] = save_artifact(data)
+    except Exception as e:
+        messages.error(request, f"Decompression failed: {e}")
+        return redirect('decompressor')
+
+    compressed_size = uploaded_file.size
+    decompressed_size = sum(member.original_size for member in members)
+    messages.success(request, f"Archive opened: {len(members)} files ✅")
+
+    context = {
+        "decompressed_size": bytes_to_mb(decompressed_size),
+        "compressed_size": bytes_to_mb(compressed_size),
+        "ratio": calculate_compression_ratio(compressed_size, decompressed_size),
+        "time_taken": end - start,
+        "name": uploaded_file.name,
+        "codec": codec,
+        "members": [{"index": index, "name": member_filename(member), "size": bytes_to_mb(member.original_size)}
+                    for index, member in enumerate(members)],
+    }
+    return render(request, 'compressor/decompressor.html', context)
 
 
 # Decompressor View
 def decompressor(request):
     """
     Handles file decompression:
-    - Reads uploaded .huff file
-    - Decompresses using Huffman decoding
-    - Calculates decompression ratio
-    - Stores decompressed data in session for download
+    - Memory-maps the uploaded .huff file from its temporary file on disk
+    - Serves repeated uploads from the result cache, otherwise decompresses using Huffman decoding
+    - Calculates decompression ratio and reports the codec(s) the file was compressed with
+    - Renders a preview of the first few KB, decoding only the blocks it needs
+    - Stores decompressed data in the artifact store for download
     - Prepares data for template display
+    Uploads of JOB_THRESHOLD_BYTES or more are handed to a background job instead,
+    and .hufa archives are listed for per-member download (see open_archive_upload).
     """
     decompressed_size = None
     compressed_size = None
@@ -138,6 +336,8 @@ def decompressor(request):
     start = None
     end = None
     file_name = None
+    preview = None
+    codec = None
 
     if request.method == "POST" and request.FILES.get('file'):
         uploaded_file = request.FILES.get("file")
@@ -146,27 +346,49 @@ def decompressor(request):
             messages.error(request, "No file selected")
             return redirect('decompressor')
 
-        if not uploaded_file.name.endswith(".huff"):
-            messages.error(request, "Only .huff compressed files allowed ❌")
+        if not uploaded_file.name.endswith((".huff", ".hufa")):
+            messages.error(request, "Only .huff or .hufa compressed files allowed ❌")
             return redirect('decompressor')
 
+        # Archives are only listed; members are extracted one at a time on download
+        if uploaded_file.name.endswith(".hufa"):
+            return open_archive_upload(request, uploaded_file)
+
+        # Large files are decompressed in the background; the page polls the job's progress
+        if uploaded_file.size >= settings.JOB_THRESHOLD_BYTES:
+            job = submit_job(Job.DECOMPRESS, uploaded_file)
+            return render(request, 'compressor/decompressor.html', {"job": job})
+
         # Read compressed file and decompress
         try:
-            compressed_data = uploaded_file.read()
-            start = time.time()
-            decompressed_data, ext = decompress_huffman(compressed_data)
-            end = time.time()
+            with mapped_upload(uploaded_file) as compressed_data:
+                compressed_size = len(compressed_data)
+                codec = ", ".join(container_codecs(compressed_data))
+                preview = text_preview(decompress_range(compressed_data, 0, PREVIEW_BYTES))
+                start = time.perf_counter()
+                key = result_cache.cache_key("decompress", compressed_data)
+                artifact_id = publish_cached(key)
+                if artifact_id is None:
+                    run_start = time.perf_counter()
+                    with collect_stages() as stages:
+                        decompressed_data, ext = decompress_huffman(compressed_data)
+                    metrics.observe_operation("decompress", time.perf_counter() - run_start, len(decompressed_data),
+                                              compressed_size, stages)
+                    artifact_id = publish_result(key, decompressed_data)
+                else:
+                    _, ext, _ = read_signature(compressed_data, (b"HUF1", b"HUF2", b"HUF3"))
+                    messages.info(request, "Served from cache — this file was decompressed before.")
+                end = time.perf_counter()
+
+            # Calculate sizes and compression ratio from the published artifact
+            decompressed_size = artifact_path(artifact_id).stat().st_size
+            ratio = calculate_compression_ratio(compressed_size, decompressed_size)
         except Exception as e:
             messages.error(request, f"Decompression failed: {e}")
             return redirect('decompressor')
 
-        # Calculate sizes and compression ratio
-        compressed_size = len(compressed_data)
-        decompressed_size = len(decompressed_data)
-        ratio = calculate_compression_ratio(compressed_size, decompressed_size)
-
-        # Store decompressed data and prepare filename
-        request.session['decompressed_data'] = decompressed_data.hex()
+        # Keep the artifact's id in the session and prepare filename
+        request.session['decompressed_artifact'] = artifact_id
         original_name = uploaded_file.name
 
         main_name = os.path.splitext(original_name)[0] 
@@ -190,6 +412,8 @@ def decompressor(request):
         "ratio": ratio,
         "time_taken": (end - start) if start and end else None,
         "name": file_name if file_name else None,
+        "preview": preview,
+        "codec": codec,
     }
     
     return render(request, 'compressor/decompressor.html', context)
@@ -199,26 +423,113 @@ def decompressor(request):
 def download_decompressed(request):
     """
     Sends the decompressed file to the user for download.
-    Retrieves the hex-encoded decompressed data and filename from session.
+    Streams the artifact referenced by the session straight from disk.
     """
-    # Retrieve decompressed data and filename from session
-    data_hex = request.session.get('decompressed_data')
+    # Retrieve decompressed artifact and filename from session
+    path = artifact_path(request.session.get('decompressed_artifact'))
     filename = request.session.get('decompressed_filename')
     
-    # If no decompressed file exists, show error and redirect
-    if not data_hex:
+    # If no decompressed file exists (or it has expired), show error and redirect
+    if path is None:
         messages.error(request, "No decompressed file found.")
         return redirect('decompressor')
 
-    # Convert hex data back to bytes
-    data = bytes.fromhex(data_hex)
+    # Prepare streaming HTTP response to trigger download
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=filename,
+        content_type="application/octet-stream",
+    )
+
+
+# Download One Member of an Archive
+def download_member(request, index):
+    """
+    Sends one member of the archive opened in this session to the user for download.
+    Only the central directory and that member are read and decoded.
+    """
+    path = artifact_path(request.session.get('archive_artifact'))
+
+    # If no archive was opened (or it has expired), show error and redirect
+    if path is None:
+        messages.error(request, "No archive found.")
+        return redirect('decompressor')
+
+    try:
+        filename, data = extract_member(path, index)
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect('decompressor')
 
-    # Prepare HTTP response for file download
-    response = HttpResponse(
-        data,
-        content_type="application/octet-stream"
+    return FileResponse(
+        io.BytesIO(data),
+        as_attachment=True,
+        filename=filename,
+        content_type="application/octet-stream",
     )
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
-    # Return the response to trigger download
-    return response
+
+# Prometheus Metrics
+def metrics_view(request):
+    """Returns codec latency, throughput, size, ratio and per-stage histograms in the Prometheus text format."""
+    return HttpResponse(metrics.render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# Result Cache Statistics
+def cache_stats(request):
+    """Returns the result cache's hit/miss counters and size as JSON."""
+    return JsonResponse(result_cache.cache_stats())
+
+
+# Background Job Progress
+def job_status(request, job_id):
+    """
+    Returns a background job's state as JSON for the progress bar:
+    bytes processed, estimated seconds left, and the download URL once it is done.
+    """
+    job = get_object_or_404(Job, pk=job_id)
+    eta = job_eta(job)
+
+    status = {
+        "id": str(job.pk),
+        "operation": job.operation,
+        "status": job.status,
+        "file_name": job.file_name,
+        "bytes_done": job.bytes_done,
+        "bytes_total": job.bytes_total,
+        "percent": round(100 * job.bytes_done / job.bytes_total, 1) if job.bytes_total else 0,
+        "eta_seconds": round(eta, 1) if eta is not None else None,
+        "error": job.error or None,
+        "codec": job.codec or None,
+    }
+
+    if job.status == Job.DONE:
+        status["result_size"] = job.result_size
+        status["download_url"] = reverse('job_download', args=[job.pk])
+        if job.operation == Job.COMPRESS:
+            status["ratio"] = calculate_compression_ratio(job.bytes_total, job.result_size)
+
+    return JsonResponse(status)
+
+
+# Download a Background Job's Result
+def job_download(request, job_id):
+    """
+    Sends a finished background job's result to the user for download.
+    Streams the job's artifact straight from disk.
+    """
+    job = get_object_or_404(Job, pk=job_id)
+    path = artifact_path(job.artifact) if job.status == Job.DONE else None
+
+    # If the job is not finished (or its result has expired), show error and redirect
+    if path is None:
+        messages.error(request, "No result found for this job.")
+        return redirect('compressor' if job.operation == Job.COMPRESS else 'decompressor')
+
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=job.result_name,
+        content_type="application/octet-stream",
+    )
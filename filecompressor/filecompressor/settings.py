@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -37,7 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'compressor.apps',
+    'compressor',
 ]
 
 MIDDLEWARE = [
@@ -123,6 +124,52 @@ STATICFILES_DIRS = [
 ]
 
 
+# Always spool uploads to a temporary file so the views can memory-map them
+# https://docs.djangoproject.com/en/5.2/ref/settings/#file-upload-handlers
+
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+
+# Compression results served for download (see compressor/artifacts.py)
+
+ARTIFACT_ROOT = Path(tempfile.gettempdir()) / 'filecompressor-artifacts'
+ARTIFACT_TTL = 60 * 60                  # Seconds a result stays downloadable
+ARTIFACT_MAX_BYTES = 2 * 1024 ** 3      # Oldest results are evicted beyond this total size
+
+
+# Content-addressed cache of results for repeated uploads (see compressor/result_cache.py)
+
+RESULT_CACHE_ROOT = Path(tempfile.gettempdir()) / 'filecompressor-cache'
+RESULT_CACHE_MAX_BYTES = 4 * 1024 ** 3  # Least recently used results are evicted beyond this total size
+
+
+# Codec used by the web app and API: a registered codec name (huffman, lz77, zlib, bz2, lzma),
+# or "auto" to pick one per upload by trial-compressing a sample under CODEC_POLICY
+# (see compressor/algorithm/registry.py)
+
+COMPRESSION_CODEC = 'auto'
+CODEC_POLICY = 'balanced'              # ratio, balanced or speed
+
+
+# Background jobs for large uploads (see compressor/jobs.py)
+
+JOB_ROOT = Path(tempfile.gettempdir()) / 'filecompressor-jobs'
+JOB_THRESHOLD_BYTES = 64 * 1024 ** 2    # Uploads at least this large are processed in the background
+JOB_WORKERS = 2                         # Jobs run at the same time (threads in the web server process)
+JOB_CODEC_WORKERS = 1                   # Processes used by each job's codec (None = one per CPU core)
+JOB_PROGRESS_INTERVAL = 0.5             # Seconds between progress updates written to the database
+JOB_LEASE_SECONDS = 600                 # A job whose owner has been silent this long is taken over on restart
+JOB_RESUME_ON_START = True              # Start the job pool when a server process starts (not for manage.py commands)
+
+
+# Multi-file uploads, compressed into one archive (see compressor/algorithm/archive.py)
+
+ARCHIVE_WORKERS = 2                     # Processes compressing members in parallel (spawned; None = one per CPU core)
+ARCHIVE_PARALLEL_BYTES = 8 * 1024 ** 2  # Smaller uploads are compressed serially: spawning the pool costs ~0.4 s
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 